@@ -0,0 +1,149 @@
+import re
+
+import metrics
+from dates import normalize_date
+from general_parse_statement import table_columns, table_layouts, transaction_field
+from keywords import OUTFLOW_KEYWORDS
+
+# Most cells are plain "-1234.56" once thousands separators are gone
+_PLAIN_RE = re.compile(r"-?\d+\.\d\d")
+
+# Everything else banks print:
+#   R1,200.50   (45.00)   45.00-   1,200.00 Cr   300.00Dr   R -3.10   12
+_AMOUNT_RE = re.compile(
+    r"(?P<open>\()?\s*(?P<sign>-)?\s*(?:R\s*)?(?P<sign2>-)?"
+    r"(?P<whole>\d{1,3}(?:[, ]\d{3})+|\d+)(?:\.(?P<frac>\d{1,2}))?"
+    r"\s*(?P<trail>-)?\s*(?P<crdr>[CD]r)?\s*(?P<close>\))?",
+    re.IGNORECASE,
+)
+
+
+def _cents(text):
+    m = _AMOUNT_RE.fullmatch(text)
+    if not m or bool(m.group("open")) != bool(m.group("close")):
+        return None
+
+    frac = m.group("frac") or "0"
+    cents = int(m.group("whole").replace(",", "").replace(" ", "")) * 100 + int(frac.ljust(2, "0"))
+
+    crdr = m.group("crdr")
+    negative = m.group("sign") or m.group("sign2") or m.group("trail") or m.group("open")
+    if negative or (crdr and crdr.lower() == "dr"):
+        return -cents
+    return cents
+
+
+def to_cents(cells):
+    """
+    Convert a column of amount strings to int cents (None for blanks and
+    anything that isn't an amount). Exact, unlike float(), and handles
+    R prefixes, Cr/Dr suffixes and bracketed or trailing-minus debits.
+    """
+    plain = _PLAIN_RE.fullmatch
+    out = []
+    for c in cells:
+        if not c:
+            out.append(None)
+            continue
+
+        s = c.replace(",", "").replace(" ", "")
+        if plain(s):
+            out.append(int(s.replace(".", "")))
+        else:
+            out.append(_cents(c.strip()))
+
+    return out
+
+
+def outflow_columns(header_info, matcher=None):
+    """
+    (table, key) of the amount columns whose heading marks money going out
+    ("Money Out", "Debit", "Payments"), where banks print debits unsigned.
+    Side-by-side tables share keys, so the table index is part of the entry.
+    """
+    headings = header_info.get("headings") or []
+    tables = header_info.get("tables") or table_layouts(headings, matcher=matcher)
+    text_at = {h["x"]: h["text"].lower() for h in headings}
+    return {
+        (table, key) for role, key, x, table in table_columns(tables)
+        if role == "amount" and any(w in text_at.get(x, "") for w in OUTFLOW_KEYWORDS)
+    }
+
+
+def _signed_amount_cells(transactions, outflow):
+    # First filled amount column per row, and whether it's an outflow column
+    cells = []
+    negate = []
+    for tx in transactions:
+        text, out = None, False
+        table = tx.get("table", 0)
+        for key in sorted(tx):
+            if key.startswith("amount") and tx[key]:
+                text, out = tx[key], (table, key) in outflow
+                break
+        cells.append(text)
+        negate.append(out)
+    return cells, negate
+
+
+def normalize_transactions(transactions, header_info=None, period_from=None, period_to=None, matcher=None):
+    """
+    Typed columns for a page (or statement) of transactions:
+        {"date": [ISO str | None], "description": [str | None],
+         "amount": [int cents | None], "balance": [int cents | None],
+         "balance_break": [bool]}
+    Amounts are signed: with the page's header_info, unsigned values in
+    outflow columns (Money Out, Debit, ...) come out negative.
+    balance_break flags rows whose balance isn't the previous balance plus
+    the amount (see balance_breaks), checked per side-by-side table.
+    period_from/period_to (datetime.date) fill in the year on "21 Oct" dates.
+    """
+    with metrics.stage("normalize_transactions", transactions=len(transactions)) as counts:
+        outflow = outflow_columns(header_info, matcher) if header_info else set()
+        amount_cells, negate = _signed_amount_cells(transactions, outflow)
+        amounts = [
+            -cents if out and cents is not None and cents > 0 else cents
+            for cents, out in zip(to_cents(amount_cells), negate)
+        ]
+        balances = to_cents([transaction_field(tx, "balance") for tx in transactions])
+
+        # Side-by-side tables interleave their rows; each keeps its own running balance
+        tables = {}
+        for i, tx in enumerate(transactions):
+            tables.setdefault(tx.get("table", 0), []).append(i)
+        breaks = [False] * len(transactions)
+        for rows in tables.values():
+            for b in balance_breaks([amounts[i] for i in rows], [balances[i] for i in rows]):
+                breaks[rows[b]] = True
+        counts["balance_breaks"] = sum(breaks)
+
+        dates = [transaction_field(tx, "date") for tx in transactions]
+        return {
+            "date": [normalize_date(d, period_from, period_to) if d else None for d in dates],
+            "description": [transaction_field(tx, "description") for tx in transactions],
+            "amount": amounts,
+            "balance": balances,
+            "balance_break": breaks,
+        }
+
+
+def balance_breaks(amounts, balances):
+    """
+    Indexes of rows whose balance isn't the previous balance plus the row's
+    amount. One pass, carrying the running balance along; a row without an
+    amount or balance restarts the running total from the next balance seen.
+    The first row is never a break since there's nothing to check it against.
+    """
+    breaks = []
+    running = None
+    for i, (amount, balance) in enumerate(zip(amounts, balances)):
+        if running is not None and amount is not None:
+            running += amount
+            if balance is not None and balance != running:
+                breaks.append(i)
+        if amount is None and balance is None:
+            running = None
+        elif balance is not None:
+            running = balance
+
+    return breaks
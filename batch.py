@@ -0,0 +1,278 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import SimpleQueue
+from multiprocessing.util import Finalize
+
+from extract_pymupdf import extract_text_pymupdf
+from general_parse_statement import general_parse_statement
+from layout_cache import LayoutCache
+from result_cache import ResultCache, parse_with_cache
+from writers import WRITERS, open_writer
+
+
+def collect_pdfs(inputs):
+    """
+    Expand directories and glob patterns into a sorted, de-duplicated list of PDFs.
+    """
+    paths = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            matches = glob.glob(os.path.join(entry, "*.pdf")) + glob.glob(os.path.join(entry, "*.PDF"))
+        else:
+            matches = glob.glob(entry)
+        paths.extend(m for m in matches if os.path.isfile(m))
+
+    return sorted(set(paths))
+
+
+_cache = None
+_layout_cache = None
+_options = {}
+_started = None
+
+
+def init_worker(cache_dir=None, cache_bytes=512 * 1024 * 1024, prefilter=False, layout_cache=None, started=None):
+    global _cache, _layout_cache, _options, _started
+
+    if cache_dir:
+        _cache = ResultCache(cache_dir, max_bytes=cache_bytes)
+    if layout_cache:
+        # One per process, written back when the process exits (pool workers
+        # included, which skip atexit but run multiprocessing finalizers)
+        _layout_cache = LayoutCache(layout_cache)
+        Finalize(_layout_cache, _layout_cache.save, exitpriority=10)
+    _options = {"prefilter": prefilter}
+    # Queue the pool's owner reads to see which files were in flight if a worker dies
+    _started = started
+
+
+def parse_file(path, prefilter=False, layout_cache=None):
+    skipped = []
+    items = extract_text_pymupdf(path, prefilter=prefilter, skipped=skipped)
+    parsed = general_parse_statement(items, layout_cache=layout_cache)
+    if prefilter:
+        parsed["skipped_pages"] = skipped
+    return parsed
+
+
+def process_file(path):
+    # Runs in a worker process; never raises so one bad file can't stop the batch
+    if _started is not None:
+        _started.put(path)
+    try:
+        parsed = parse_with_cache(
+            path, lambda p: parse_file(p, layout_cache=_layout_cache, **_options), _cache, _options
+        )
+        return {"file": path, "ok": True, "result": parsed}
+    except Exception as e:
+        return {
+            "file": path,
+            "ok": False,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def input_root(paths):
+    """
+    Deepest directory containing every input, so outputs can mirror the
+    layout below it.
+    """
+    if not paths:
+        return ""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+
+
+def output_path_for(path, out_dir, root=None):
+    # a/s.pdf and b/s.pdf under root become out_dir/a/s.json and out_dir/b/s.json,
+    # so same-named statements from different folders don't overwrite each other
+    if root is None:
+        rel = os.path.basename(path)
+    else:
+        rel = os.path.relpath(os.path.abspath(path), root)
+    return os.path.join(out_dir, os.path.splitext(rel)[0] + ".json")
+
+
+def statement_pages(result):
+    """
+    Yield (page_number, header_info, transactions) for each parsed page of a
+    general_parse_statement result, so every page is written with its own header.
+    """
+    transactions = result["transactions"]
+    counts = result["transaction_counts"]
+
+    start = 0
+    # Keys are strings once a result has been through JSON (the result cache)
+    for pg, header_info in result["headings"].items():
+        n = counts[pg]
+        yield int(pg), header_info, transactions[start : start + n]
+        start += n
+
+
+def _run_pool(paths, workers, initargs, on_record):
+    """
+    Run process_file over paths in one pool, passing each record to on_record.
+    Returns (lost, in_flight): the paths that never finished because a
+    worker process died (MuPDF crashing on a malformed PDF, the OOM killer),
+    and which of those had already started in a worker.
+    """
+    started = SimpleQueue()
+    done = set()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(*initargs, started)) as pool:
+        futures = [pool.submit(process_file, p) for p in paths]
+
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                continue
+            done.add(record["file"])
+            on_record(record)
+
+    lost = [p for p in paths if p not in done]
+    in_flight = set()
+    while lost and not started.empty():
+        in_flight.add(started.get())
+    return lost, in_flight
+
+
+def run_batch(
+    paths, workers=None, out_dir=None, jsonl=None, cache_dir=None, cache_bytes=512 * 1024 * 1024, prefilter=False,
+    table=None, layout_cache=None,
+):
+    """
+    Parse every PDF in paths using a pool of worker processes.
+    Writes one JSON file per statement into out_dir (mirroring the
+    folders below the inputs' common directory) and/or one line per
+    statement into the jsonl stream. table is a writers writer that gets
+    every transaction as each statement finishes. With cache_dir, results are shared
+    through a ResultCache so re-submitted PDFs skip parsing. With prefilter,
+    pages without a transaction table are skipped and listed per result.
+    layout_cache is a LayoutCache JSON file each worker loads header
+    templates from and saves new ones back to when it exits.
+    If a worker process dies, the files it may have been parsing are
+    retried one at a time in a pool of their own (failing the one that
+    kills it again) and the rest carry on in a new pool.
+    Returns (succeeded, failed) lists of paths.
+    """
+    succeeded = []
+    failed = []
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    root = input_root(paths)
+
+    def on_record(record):
+        path = record["file"]
+
+        if record["ok"]:
+            succeeded.append(path)
+            if out_dir:
+                out_path = output_path_for(path, out_dir, root)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                with open(out_path, "w") as f:
+                    json.dump(record["result"], f, indent=2)
+            if table:
+                # Per page: cover pages have no header, and layouts can change mid-statement
+                for pg, header_info, transactions in statement_pages(record["result"]):
+                    table.write(path, transactions, page=pg, header_info=header_info)
+        else:
+            failed.append(path)
+            print(f"FAILED {path}: {record['error']}", file=sys.stderr)
+
+        if jsonl:
+            record.pop("traceback", None)
+            jsonl.write(json.dumps(record) + "\n")
+            jsonl.flush()
+
+    initargs = (cache_dir, cache_bytes, prefilter, layout_cache)
+    pending = list(paths)
+    suspects = []
+
+    while pending or suspects:
+        if suspects:
+            # On its own, a file that kills the pool can only be that file's fault
+            path = suspects.pop(0)
+            lost, _ = _run_pool([path], 1, initargs, on_record)
+            if lost:
+                on_record({"file": path, "ok": False, "error": "BrokenProcessPool: worker process died parsing this file"})
+            continue
+
+        lost, in_flight = _run_pool(pending, workers, initargs, on_record)
+        if lost and not in_flight:
+            # Workers died before starting anything (e.g. init_worker failed): retrying won't help
+            for path in lost:
+                on_record({"file": path, "ok": False, "error": "BrokenProcessPool: worker processes failed to start"})
+            break
+        if lost:
+            print(f"Worker process died; retrying {len(lost)} unfinished files", file=sys.stderr)
+        suspects = [p for p in lost if p in in_flight]
+        pending = [p for p in lost if p not in in_flight]
+
+    return succeeded, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a batch of bank statement PDFs.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-o", "--out-dir", help="write one <name>.json per statement into this directory")
+    parser.add_argument("--jsonl", help="write one JSON line per statement to this file ('-' for stdout)")
+    parser.add_argument("--table", help="write every transaction to one .ndjson/.csv/.parquet/.arrow file")
+    parser.add_argument("--table-format", choices=sorted(WRITERS), help="format for --table (default: from its extension)")
+    parser.add_argument("--prefilter", action="store_true", help="skip pages with no transaction table before full extraction")
+    parser.add_argument("--cache-dir", help="reuse parsed results for identical PDFs from this directory")
+    parser.add_argument("--cache-size-mb", type=int, default=512, help="result cache size limit (default: 512)")
+    parser.add_argument("--layout-cache", help="JSON file of known header layouts, reused and updated across runs")
+    args = parser.parse_args(argv)
+
+    if not args.out_dir and not args.jsonl and not args.table:
+        parser.error("give --out-dir, --jsonl and/or --table")
+
+    paths = collect_pdfs(args.inputs)
+    if not paths:
+        parser.error("no PDF files matched")
+
+    jsonl = None
+    if args.jsonl == "-":
+        # The stream gets a private copy of stdout and fd 1 is pointed at
+        # stderr, so prints from libraries or workers stay out of the JSON lines
+        sys.stdout.flush()
+        jsonl = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    elif args.jsonl:
+        jsonl = open(args.jsonl, "w")
+
+    table = open_writer(args.table, args.table_format) if args.table else None
+
+    try:
+        succeeded, failed = run_batch(
+            paths,
+            workers=args.workers,
+            out_dir=args.out_dir,
+            jsonl=jsonl,
+            cache_dir=args.cache_dir,
+            cache_bytes=args.cache_size_mb * 1024 * 1024,
+            prefilter=args.prefilter,
+            table=table,
+            layout_cache=args.layout_cache,
+        )
+    finally:
+        if table:
+            table.close()
+        if jsonl:
+            jsonl.close()
+
+    print(f"Processed {len(paths)} files: {len(succeeded)} ok, {len(failed)} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
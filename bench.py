@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic_statement import HEADER_STYLES, generate_statement
+from extract_pymupdf import extract_text_pymupdf, extract_text_pymupdf_original
+from general_parse_statement import group_items_by_page, find_heading_row, extract_transactions_with_dates
+from parse_statement import parse_statement
+
+
+def measure(func):
+    """
+    Run func twice: once for wall time, once under tracemalloc for peak
+    Python memory (allocations made inside fitz/pdfminer C code aren't seen).
+    Returns (result, seconds, peak_bytes).
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+def stage_find_headings(pages):
+    headers = {}
+    for pg, page_items in sorted(pages.items()):
+        header_info = find_heading_row(page_items)
+        header_info["page_number"] = pg
+        headers[pg] = header_info
+    return headers
+
+
+def stage_extract_transactions(pages, headers):
+    transactions = []
+    for pg, page_items in sorted(pages.items()):
+        transactions.extend(extract_transactions_with_dates(page_items, headers[pg]))
+    return transactions
+
+
+def bench_statement(path, page_count, skip_pdfminer=False):
+    """
+    Time every stage on one PDF. Returns a list of
+    (stage, seconds, pages, transactions, peak_bytes) rows.
+    """
+    rows = []
+
+    items, t, peak = measure(lambda: extract_text_pymupdf(path))
+    rows.append(("extract_text_pymupdf", t, page_count, None, peak))
+
+    if not skip_pdfminer:
+        from extract_pdfminer import extract_text_pdfminer
+        _, t, peak = measure(lambda: extract_text_pdfminer(path))
+        rows.append(("extract_text_pdfminer", t, page_count, None, peak))
+
+    pages = group_items_by_page(items)
+    headers, t, peak = measure(lambda: stage_find_headings(pages))
+    rows.append(("find_heading_row", t, page_count, None, peak))
+
+    transactions, t, peak = measure(lambda: stage_extract_transactions(pages, headers))
+    rows.append(("extract_transactions_with_dates", t, page_count, len(transactions), peak))
+
+    lines = extract_text_pymupdf_original(path)
+    try:
+        parsed, t, peak = measure(lambda: parse_statement(lines))
+        rows.append(("parse_statement", t, page_count, len(parsed["transactions"]), peak))
+    except Exception as e:
+        # The line parser only understands Capitec-style flat text
+        rows.append(("parse_statement", None, page_count, f"{type(e).__name__}", None))
+
+    return rows
+
+
+def format_rows(label, rows):
+    out = [f"\n{label}", f"  {'stage':<34}{'seconds':>10}{'pages/s':>12}{'tx/s':>12}{'peak MiB':>10}"]
+    for stage, t, pages, tx, peak in rows:
+        if t is None:
+            out.append(f"  {stage:<34}{'failed: ' + str(tx):>44}")
+            continue
+        pps = pages / t if t else float("inf")
+        tps = f"{tx / t:,.0f}" if isinstance(tx, int) and t else "-"
+        out.append(f"  {stage:<34}{t:>10.4f}{pps:>12,.1f}{tps:>12}{peak / 2**20:>10.2f}")
+    return "\n".join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction and parsing on synthetic statements.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[20], help="page counts to test")
+    parser.add_argument("--density", type=int, nargs="+", default=[40], help="transactions per page")
+    parser.add_argument("--styles", nargs="+", default=list(HEADER_STYLES), choices=list(HEADER_STYLES))
+    parser.add_argument("--layouts", nargs="+", default=["single", "dual"], choices=["single", "dual"])
+    parser.add_argument("--skip-pdfminer", action="store_true", help="leave out the (slow) pdfminer stage")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for style in args.styles:
+            for layout in args.layouts:
+                for pages in args.pages:
+                    for density in args.density:
+                        path = os.path.join(tmp, f"{style}_{layout}_{pages}_{density}.pdf")
+                        generate_statement(path, pages=pages, rows_per_page=density, style=style, dual=layout == "dual")
+                        rows = bench_statement(path, pages, skip_pdfminer=args.skip_pdfminer)
+                        print(format_rows(f"{style} / {layout} / {pages} pages / {density} rows per page", rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import re
+from datetime import date
+from functools import lru_cache
+
+# One pattern for every date format we see on statements:
+#   07/12/2025, 7/12/25                 (day/month/year)
+#   7th December 2025, 7th Dec 24
+#   7 December 2025, 13 Nov 24, 21 Oct  (year is optional on some statements)
+DATE_RE = re.compile(
+    r"^(?:"
+    r"(?P<num_day>\d{1,2})/(?P<num_month>\d{1,2})/(?P<num_year>\d{2,4})"
+    r"|"
+    r"(?P<day>\d{1,2})(?:[a-z]{2})?\s+(?P<month>[a-z]{3,9})(?:\s+(?P<year>\d{2,4}))?"
+    r")$",
+    re.IGNORECASE,
+)
+
+# Unanchored, lenient version for spotting dates anywhere in a page of lower-cased text
+DATE_SEARCH_RE = re.compile(r"\b\d{1,2}(?:/\d{1,2}/\d{2,4}|(?:[a-z]{2})?\s+[a-z]{3,9}\b)")
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+
+@lru_cache(maxsize=4096)
+def _split_date(text):
+    """
+    Return (day, month, year) for a date string, with year None when the
+    statement leaves it off. Returns None for anything that isn't a date.
+    """
+    m = DATE_RE.match(text)
+    if not m:
+        return None
+
+    if m.group("num_day"):
+        day, month, year = int(m.group("num_day")), int(m.group("num_month")), m.group("num_year")
+    else:
+        month = MONTHS.get(m.group("month")[:3].lower())
+        if month is None:
+            return None
+        day, year = int(m.group("day")), m.group("year")
+
+    if year is not None:
+        year = int(year)
+        if year < 100:
+            year += 2000 if year < 69 else 1900  # same pivot as strptime's %y
+
+    return day, month, year
+
+
+@lru_cache(maxsize=4096)
+def is_valid_date(text, allow_no_year=False):
+    """
+    True if text looks like a statement date. Dates without a year only
+    count when allow_no_year is set.
+    """
+    m = DATE_RE.match(text.strip())
+    if not m:
+        return False
+    return allow_no_year or m.group("num_year") is not None or m.group("year") is not None
+
+
+def _infer_year(day, month, period_from, period_to):
+    # Pick the year that puts the date inside the statement period,
+    # falling back to the period's end year
+    if period_from is None and period_to is None:
+        return None
+
+    start = period_from or period_to
+    end = period_to or period_from
+    for year in range(start.year, end.year + 1):
+        try:
+            d = date(year, month, day)
+        except ValueError:
+            continue
+        if start <= d <= end:
+            return year
+
+    return end.year
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(text, period_from=None, period_to=None):
+    """
+    Convert a statement date to an ISO "YYYY-MM-DD" string, or None if it
+    can't be parsed. period_from/period_to (datetime.date) are used to fill
+    in the year for dates like "21 Oct".
+    Results are cached per (text, period) since statements repeat the same
+    few dozen dates thousands of times.
+    """
+    parts = _split_date(text.strip())
+    if parts is None:
+        return None
+
+    day, month, year = parts
+    if year is None:
+        year = _infer_year(day, month, period_from, period_to)
+        if year is None:
+            return None
+
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def to_date(iso):
+    """
+    Turn the output of normalize_date back into a datetime.date (or None).
+    """
+    return date.fromisoformat(iso) if iso else None
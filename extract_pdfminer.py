@@ -1,5 +1,119 @@
-from pdfminer.high_level import extract_text
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from pdfminer.high_level import extract_pages, extract_text
+from pdfminer.layout import LAParams, LTTextContainer, LTTextLine
+from pdfminer.pdfpage import PDFPage
+
+import metrics
+from page_ranges import page_ranges
+from pdf_input import BufferReader, as_source, attach, shared_source
+
+# Tuned for statement tables: a tighter char_margin keeps neighbouring
+# columns as separate lines (matching PyMuPDF's output), and
+# boxes_flow=None skips pdfminer's text-box reading-order pass, which we
+# don't need since the parser orders items by position itself.
+STATEMENT_LAPARAMS = LAParams(char_margin=1.0, boxes_flow=None)
+
+
+@contextmanager
+def _pdf_file(source):
+    # pdfminer takes a path or a binary file; buffers are read in place.
+    # pdfminer's objects outlive the call, so the reader's view is released
+    # on exit - otherwise an mmap passed in can't be closed until a gc run
+    source = as_source(source)
+    if not isinstance(source, memoryview):
+        yield source
+        return
+
+    with BufferReader(source) as f:
+        yield f
+
 
 def extract_text_pdfminer(path):
-    text = extract_text(path)
-    return text.split("\n")
\ No newline at end of file
+    with _pdf_file(path) as source:
+        text = extract_text(source)
+    return text.split("\n")
+
+
+def count_pages_pdfminer(path):
+    with _pdf_file(path) as source:
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                return sum(1 for _ in PDFPage.get_pages(f))
+        return sum(1 for _ in PDFPage.get_pages(source))
+
+
+def _layout_items(path, page_numbers, laparams):
+    # Runs in worker processes too, where in-memory PDFs arrive as a SharedRef
+    with attach(path) as source:
+        return _layout_source_items(source, page_numbers, laparams)
+
+
+def _layout_source_items(source, page_numbers, laparams):
+    lines = []
+    with _pdf_file(source) as f:
+        pages = extract_pages(f, page_numbers=page_numbers, laparams=laparams)
+        for pno, page in zip(sorted(page_numbers), pages):
+            lines.extend(_page_lines(page, pno))
+
+    return lines
+
+
+def _page_lines(page, pno):
+    # pdfminer's y axis points up from the bottom of the page; flip it so
+    # "y" is the distance of the line's top edge from the top, like PyMuPDF
+    lines = []
+    for element in page:
+        if not isinstance(element, LTTextContainer):
+            continue
+
+        for line in element:
+            if not isinstance(line, LTTextLine):
+                continue
+
+            text = line.get_text().strip()
+            if not text:
+                continue
+
+            lines.append({
+                "text": text,
+                "x": line.x0,
+                "y": page.height - line.y1,
+                "page_number": pno + 1
+            })
+
+    return lines
+
+
+def extract_items_pdfminer(path, page_numbers=None, laparams=None, workers=1):
+    """
+    Positioned text lines in the same {"text", "x", "y", "page_number"}
+    shape as extract_text_pymupdf, so general_parse_statement can use them.
+    path may also be an in-memory PDF (bytes, memoryview, mmap, BytesIO).
+    page_numbers are 0-based page indexes (default: every page).
+    With workers > 1 the pages are split into contiguous ranges and laid out
+    in separate processes; results come back in page order.
+    """
+    laparams = laparams or STATEMENT_LAPARAMS
+    if page_numbers is None:
+        page_numbers = range(count_pages_pdfminer(path))
+    page_numbers = sorted(page_numbers)
+
+    with metrics.stage("extract_items_pdfminer", pages=len(page_numbers)) as counts:
+        ranges = page_ranges(len(page_numbers), min(workers or 1, len(page_numbers) or 1))
+        if len(ranges) > 1:
+            lines = []
+            with shared_source(path) as source, ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(_layout_items, source, page_numbers[start:stop], laparams)
+                    for start, stop in ranges
+                ]
+                for future in futures:
+                    lines.extend(future.result())
+        else:
+            lines = _layout_items(path, page_numbers, laparams)
+
+        counts["items"] = len(lines)
+
+    return lines
@@ -1,41 +1,228 @@
-import fitz
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_text_pymupdf(path):
-    doc = fitz.open(path)
+try:
+    # Newer PyMuPDF prints a deprecation warning to stdout on "import fitz",
+    # which would land in the worker's and batch's stdout protocols
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
+import metrics
+from dates import DATE_SEARCH_RE
+from keywords import DEFAULT_MATCHER
+from page_ranges import page_ranges
+from pdf_input import as_source, attach, shared_source
+from text_items import TextItem
+
+# Default dict-mode flags minus images: we never use image blocks, so don't decode them
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def open_pdf(source):
+    """
+    Open a PDF from a file path or an in-memory buffer (bytes, bytearray,
+    memoryview, mmap, BytesIO). Buffers are read in place, not copied.
+    """
+    source = as_source(source)
+    if isinstance(source, memoryview):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def page_may_have_transactions(text, matcher=None):
+    """
+    Cheap check on a page's plain text: a transaction table needs a date
+    column heading and at least one date. Errs on the side of keeping pages.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+    text = text.lower()
+    if not any(k in text for k in matcher.role_keywords["date"]):
+        return False
+    return DATE_SEARCH_RE.search(text) is not None
+
+
+def _page_items(page, compact=False, textpage=None, flat=None):
+    # With a flat list, also append the page's plain-text lines to it, the
+    # same lines page.get_text().split("\n") gives, from the same dict output
+    page_number = page.number  # <-- this guy matters
+    blocks = page.get_text("dict", textpage=textpage, flags=TEXT_FLAGS)["blocks"]
     lines = []
 
-    for page in doc:
-        page_number = page.number  # <-- this guy matters
-        blocks = page.get_text("dict")["blocks"]
+    for block in blocks:
+        if "lines" not in block:
+            continue
+
+        for line in block["lines"]:
+            if flat is not None:
+                flat.append("".join(span["text"] for span in line["spans"]))
 
-        for block in blocks:
-            if "lines" not in block:
+            # Combine all span text into one full line
+            full_text = " ".join(span["text"] for span in line["spans"]).strip()
+            if not full_text:
                 continue
 
-            for line in block["lines"]:
-                # Combine all span text into one full line
-                full_text = " ".join(span["text"] for span in line["spans"]).strip()
-                if not full_text:
-                    continue
+            x0, y0, x1, y1 = line["bbox"]
+
+            if compact:
+                lines.append(TextItem(full_text, x0, y0, page_number + 1))
+                continue
+
+            lines.append({
+                "text": full_text,
+                "x": x0,
+                "y": y0,
+                "page_number": page_number + 1
+            })
+
+    if flat is not None:
+        flat.append("")  # plain text ends each page with a newline
+    return lines
+
+
+def read_page(page, compact=False, prefilter=None, clip=None):
+    """
+    Items for one page, or None when prefilter (a KeywordMatcher) rules the
+    page out. The text layout is built once and shared by the plain-text
+    check and the dict extraction, so kept pages cost little extra.
+    clip (x0, y0, x1, y1) restricts extraction to that region of the page.
+    """
+    if prefilter is None and clip is None:
+        return _page_items(page, compact)
+
+    textpage = page.get_textpage(clip=clip, flags=TEXT_FLAGS)
+    if prefilter is not None and not page_may_have_transactions(page.get_text("text", textpage=textpage), prefilter):
+        return None
+    return _page_items(page, compact, textpage)
+
+
+def _extract_page_range(path, start, stop, compact=False, prefilter=None):
+    # Runs inside a worker process: every worker opens its own document,
+    # in-memory PDFs arrive as a SharedRef rather than a pickled copy
+    with attach(path) as source:
+        doc = open_pdf(source)
+        lines = []
+        skipped = []
+        for pno in range(start, stop):
+            items = read_page(doc[pno], compact, prefilter)
+            if items is None:
+                skipped.append(pno + 1)
+            else:
+                lines.extend(items)
+        doc.close()
+    return lines, skipped
 
-                x0, y0, x1, y1 = line["bbox"]
 
-                lines.append({
-                    "text": full_text,
-                    "x": x0,
-                    "y": y0,
-                    "page_number": page_number + 1 
-                })
+def extract_text_pymupdf(path, workers=1, compact=False, prefilter=False, skipped=None, matcher=None):
+    """
+    Extract positioned text lines from every page.
+    With workers > 1 the pages are split into contiguous ranges and decoded
+    in separate processes; results are merged back in page order.
+    With compact=True lines come back as TextItem records instead of dicts.
+    With prefilter=True pages that can't hold a transaction table (cover
+    pages, T&Cs, inserts) are skipped before the full dict extraction;
+    their page numbers are appended to the skipped list if one is given.
+    """
+    prefilter = (matcher or DEFAULT_MATCHER) if prefilter else None
+    if skipped is None:
+        skipped = []
 
+    with metrics.stage("extract_text_pymupdf") as counts:
+        lines = _extract_text_pymupdf(path, workers, compact, prefilter, skipped, counts)
+        counts["items"] = len(lines)
+        counts["skipped_pages"] = len(skipped)
     return lines
 
 
+def _extract_text_pymupdf(path, workers, compact, prefilter, skipped, counts):
+    if workers and workers > 1:
+        with open_pdf(path) as doc:
+            page_count = doc.page_count
+        counts["pages"] = page_count
+
+        ranges = page_ranges(page_count, min(workers, page_count))
+        if len(ranges) > 1:
+            lines = []
+            with shared_source(path) as source, ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(_extract_page_range, source, start, stop, compact, prefilter)
+                    for start, stop in ranges
+                ]
+                for future in futures:
+                    range_lines, range_skipped = future.result()
+                    lines.extend(range_lines)
+                    skipped.extend(range_skipped)
+            return lines
+
+    doc = open_pdf(path)
+    counts["pages"] = doc.page_count
+    lines = []
+
+    for page in doc:
+        items = read_page(page, compact, prefilter)
+        if items is None:
+            skipped.append(page.number + 1)
+        else:
+            lines.extend(items)
+
+    return lines
+
+
+def iter_text_pymupdf(path, compact=False, prefilter=False, skipped=None, matcher=None):
+    """
+    Yield (page_number, items) one page at a time so callers can stream
+    pages into the parser without holding the whole document.
+    prefilter/skipped work as in extract_text_pymupdf.
+    """
+    prefilter = (matcher or DEFAULT_MATCHER) if prefilter else None
+    with open_pdf(path) as doc:
+        for page in doc:
+            # Timed per page, so the consumer's work between pages isn't counted
+            with metrics.stage("extract_text_pymupdf", pages=1) as counts:
+                items = read_page(page, compact, prefilter)
+                counts["items"] = len(items) if items is not None else 0
+                counts["skipped_pages"] = int(items is None)
+            if items is None:
+                if skipped is not None:
+                    skipped.append(page.number + 1)
+                continue
+            yield page.number + 1, items
+
+
+def extract_items_and_lines(path, compact=False):
+    """
+    Decode every page once and return (items, lines): the positioned items
+    of extract_text_pymupdf for general_parse_statement, and the flat text
+    lines of extract_text_pymupdf_original for parse_statement.
+    """
+    with metrics.stage("extract_items_and_lines") as counts:
+        items = []
+        lines = []
+        with open_pdf(path) as doc:
+            counts["pages"] = doc.page_count
+            for page in doc:
+                items.extend(_page_items(page, compact, flat=lines))
+
+        counts["items"] = len(items)
+        counts["lines"] = len(lines)
+    return items, lines
+
+
+def iter_lines_pymupdf(path):
+    """
+    Lazy version of extract_text_pymupdf_original: yields the same lines,
+    one page's text at a time, for the streaming parse_statement.
+    """
+    doc = open_pdf(path)
+    for page in doc:
+        yield from page.get_text().split("\n")
+
+
 def extract_text_pymupdf_original(path):
-    doc = fitz.open(path)
+    doc = open_pdf(path)
     lines = []
 
     for page in doc:
         text = page.get_text()
         lines.extend(text.split("\n"))
 
-    return lines
\ No newline at end of file
+    return lines
@@ -0,0 +1,62 @@
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# name -> (module, function). Modules are only imported when a backend is
+# first asked for, so a run that uses PyMuPDF never pays for pdfminer's import
+# (and vice versa).
+EXTRACTORS = {
+    "pymupdf": ("extract_pymupdf", "extract_text_pymupdf"),
+    "pymupdf_text": ("extract_pymupdf", "extract_text_pymupdf_original"),
+    "pymupdf_pages": ("extract_pymupdf", "iter_text_pymupdf"),
+    "pymupdf_lines": ("extract_pymupdf", "iter_lines_pymupdf"),
+    "pymupdf_both": ("extract_pymupdf", "extract_items_and_lines"),
+    "pdfminer": ("extract_pdfminer", "extract_text_pdfminer"),
+    "pdfminer_items": ("extract_pdfminer", "extract_items_pdfminer"),
+    "auto": ("extractors", "extract_items_auto"),
+}
+
+
+def get_extractor(name):
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor {name!r}, expected one of: {', '.join(EXTRACTORS)}")
+
+    module_name, func_name = EXTRACTORS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def looks_degenerate(items, max_garbage=0.05, min_avg_len=2):
+    """
+    True when positioned items look unusable: nothing extracted, lots of
+    undecodable glyphs (missing ToUnicode maps), or text split into
+    single characters.
+    """
+    if not items:
+        return True
+
+    text = "".join(i["text"] for i in items)
+    garbage = text.count("�") + text.count("(cid:") * 5
+    if garbage / len(text) > max_garbage:
+        return True
+
+    return len(text) / len(items) < min_avg_len
+
+
+def extract_items_auto(path, workers=1):
+    """
+    Positioned items from the fastest backend that gives usable output:
+    PyMuPDF, falling back to pdfminer only when PyMuPDF's result looks
+    degenerate (and pdfminer's doesn't).
+    """
+    items = get_extractor("pymupdf")(path, workers=workers)
+    if not looks_degenerate(items):
+        return items
+
+    logger.info("PyMuPDF output for %s looks degenerate, trying pdfminer", path)
+    fallback = get_extractor("pdfminer_items")(path, workers=workers)
+    if looks_degenerate(fallback):
+        return items
+
+    return fallback
@@ -1,21 +1,14 @@
-import re
-from datetime import datetime
+import logging
 import statistics
 from collections import Counter
+from bisect import bisect_left
+import heapq
 
-# regex patterns for common date formats
-DATE_PATTERNS = [
-    r"^\d{1,2}/\d{1,2}/\d{2,4}$",            # 07/12/2025 or 7/12/25
-    r"^\d{1,2}[a-z]{2}\s+[A-Za-z]{3,9}\s+\d{2,4}$",  # 7th December 2025 or 7th Dec 24
-    r"^\d{1,2}\s+[A-Za-z]{3,9}\s+\d{2,4}$",          # 7 December 2025 or 13 Nov 24
-]
+import metrics
+from dates import is_valid_date
+from keywords import DEFAULT_MATCHER
 
-def is_valid_date(text):
-    text = text.strip()
-    for pattern in DATE_PATTERNS:
-        if re.match(pattern, text, re.IGNORECASE):
-            return True
-    return False
+logger = logging.getLogger(__name__)
 
 def is_number(value):
     try:
@@ -24,52 +17,6 @@ def is_number(value):
     except (ValueError, AttributeError):
         return False
 
-def detect_two_tables(transactions):
-    total_with_date2 = 0
-    mismatches = 0
-
-    for row in transactions:
-        d1 = row.get("date1")
-        d2 = row.get("date2")
-
-        if d2:
-            total_with_date2 += 1
-            if d1 != d2:
-                mismatches += 1
-
-    if total_with_date2 == 0:
-        return False
-
-    ratio = mismatches / total_with_date2
-
-    return ratio > 0.7
-
-def split_if_two_tables(transactions):
-    if not detect_two_tables(transactions):
-        return transactions
-
-    final = []
-
-    for row in transactions:
-        left = {}
-        right = {}
-
-        for key, value in row.items():
-            if key.endswith("1"):
-                left[key[:-1]] = value
-            elif key.endswith("2"):
-                right[key[:-1]] = value
-
-        # Add left (if meaningful)
-        if any(v for v in left.values()):
-            final.append(left)
-
-        # Add right (if meaningful)
-        if any(v for v in right.values()):
-            final.append(right)
-
-    return final
-
 def expand_wrapped_headers(header_info, items, y_tol=6, x_tol=12):
     """
     After finding main header row, check nearby y-coordinates for wrapped text
@@ -98,53 +45,114 @@ def expand_wrapped_headers(header_info, items, y_tol=6, x_tol=12):
     header_info["headings"] = merged
     return header_info
 
-def detect_and_merge_headers(items, y_tol=6, x_tol=12, min_cols=3):
+def cluster_rows(items, y_tol=6):
+    """
+    Group items into rows with a single sweep down the page.
+    Each row is anchored at its topmost item's y and takes every following
+    item within y_tol of that anchor. Anchors end up more than y_tol apart,
+    so only the most recent row can ever match - no need to check them all.
+    """
+    rows = []
+    row = None
+    for it in sorted(items, key=lambda i: i["y"]):
+        if row is not None and it["y"] - row["y"] <= y_tol:
+            row["items"].append(it)
+        else:
+            row = {"y": it["y"], "items": [it]}
+            rows.append(row)
+    return rows
+
+def iter_rows_top_down(items, y_tol=6):
+    """
+    Lazy cluster_rows: the same rows, produced top to bottom from a heap,
+    so a caller that stops after the first few rows only pays for those.
+    """
+    heap = [(it["y"], n, it) for n, it in enumerate(items)]
+    heapq.heapify(heap)
+
+    row = None
+    while heap:
+        y, _, it = heapq.heappop(heap)
+        if row is not None and y - row["y"] <= y_tol:
+            row["items"].append(it)
+            continue
+        if row is not None:
+            yield row
+        row = {"y": y, "items": [it]}
+
+    if row is not None:
+        yield row
+
+def is_table_header(row_items, matcher=None):
+    """
+    True if a row's cells cover the columns a transaction table needs:
+    date, description, and amount or balance.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+    roles = {matcher.role(it["text"].lower()) for it in row_items}
+    return "date" in roles and "description" in roles and ("amount" in roles or "balance" in roles)
+
+def find_header_top_down(items, y_tol=6, x_tol=12, min_hits=3, min_cols=3, matcher=None):
+    """
+    Scan rows from the top of the page and stop at the first one that
+    looks like a transaction table header: at least min_hits header
+    keywords, min_cols items, and cells for a date, a description and an
+    amount or balance. Summary boxes above the table ("Statement Date |
+    Credit Limit | Available Balance | Payment Due") can score as many
+    keywords but never have that full set of columns.
+    Returns {"headings", "y"} or None.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+
+    rows = iter_rows_top_down([i for i in items if i["text"].strip()], y_tol)
+    above = []
+    best_row = None
+    for row in rows:
+        if len(row["items"]) >= min_cols:
+            txt = " ".join(it["text"] for it in row["items"]).lower()
+            if matcher.hits(txt) >= min_hits and is_table_header(row["items"], matcher):
+                best_row = row
+                break
+        above.append(row)
+
+    if best_row is None:
+        return None
+
+    # Wrapped header text just above/below the row, as in detect_and_merge_headers
+    best_y = best_row["y"]
+    nearby = [i for row in above[-3:] for i in row["items"] if abs(i["y"] - best_y) <= y_tol * 2]
+    for row in rows:
+        if row["y"] - best_y > y_tol * 2:
+            break
+        nearby.extend(i for i in row["items"] if i["y"] - best_y <= y_tol * 2)
+
+    return {
+        "y": best_y,
+        "headings": merge_wrapped_headers(best_row["items"] + nearby, y_tol=y_tol, x_tol=x_tol)
+    }
+
+def detect_and_merge_headers(items, y_tol=6, x_tol=12, min_cols=3, matcher=None):
+    matcher = matcher or DEFAULT_MATCHER
 
     items = [i for i in items if i["text"].strip()]  
 
     # --- Step 1: Filter out margin/outlier rows ---
-    ys = [i["y"] for i in items]
-    median_y = statistics.median(ys)
+    median_y = statistics.median(i["y"] for i in items)
     items = [i for i in items if abs(i["y"] - median_y) < 800]
 
     if not items:
         items = [i for i in items if i["text"].strip()]
 
     # --- Step 2: Group items by approximate Y to form rows ---
-    rows = []
-    for it in sorted(items, key=lambda i: i["y"]):
-        for row in rows:
-            if abs(row["y"] - it["y"]) <= y_tol:
-                row["items"].append(it)
-                break
-        else:
-            rows.append({"y": it["y"], "items": [it]})
-
-    # --- Step 3: Merge rows that are very close vertically ---
-    merged_rows = []
-    i = 0
-    while i < len(rows):
-        curr = rows[i]
-        if i + 1 < len(rows) and abs(rows[i + 1]["y"] - curr["y"]) <= y_tol:
-            combined = curr["items"] + rows[i + 1]["items"]
-            merged_rows.append({"y": curr["y"], "items": combined})
-            i += 2
-        else:
-            merged_rows.append(curr)
-            i += 1
-
-    # --- Step 4: Score rows based on header keywords ---
-    HEADER_KEYWORDS = [
-        "date", "posting date", "transaction", "description",
-        "money in", "money out", "balance", "payments",
-        "deposits", "credit", "debit", "amount", "post date"
-    ]
+    rows = cluster_rows(items, y_tol)
 
+    # --- Step 3: Score rows based on header keywords ---
     scored = []
-    for row in merged_rows:
-        txt = " ".join(it["text"].lower() for it in row["items"])
-        hits = sum(1 for k in HEADER_KEYWORDS if k in txt)
-        spread = max(it["x"] for it in row["items"]) - min(it["x"] for it in row["items"])
+    for row in rows:
+        txt = " ".join(it["text"] for it in row["items"]).lower()
+        hits = matcher.hits(txt)
+        xs = [it["x"] for it in row["items"]]
+        spread = max(xs) - min(xs)
         scored.append({
             "row": row,
             "hits": hits,
@@ -165,16 +173,17 @@ def detect_and_merge_headers(items, y_tol=6, x_tol=12, min_cols=3):
     best_row = candidates[0]["row"]
     best_y = best_row["y"]
 
-    # --- Step 5: Look for wrapped text above/below the main header row ---
+    # --- Step 4: Look for wrapped text above/below the main header row ---
+    in_best_row = {id(i) for i in best_row["items"]}
     nearby_items = [
         i for i in items
         if abs(i["y"] - best_y) <= y_tol * 2  # extend tolerance
-        and i not in best_row["items"]
+        and id(i) not in in_best_row
     ]
 
     all_header_items = best_row["items"] + nearby_items
 
-    # --- Step 6: Merge all nearby/column-wrapped items ---
+    # --- Step 5: Merge all nearby/column-wrapped items ---
     final_headers = merge_wrapped_headers(all_header_items, y_tol=y_tol, x_tol=x_tol)
 
     return {
@@ -225,11 +234,13 @@ def parse_page(items, chunk_size=3000):
         return []  # page with no transactions
     return extract_transactions_with_dates(items, header_info)
 
-def detect_headings(items, y_tol=10, x_merge_tol=8, min_cols=3):
+def detect_headings(items, y_tol=10, x_merge_tol=8, min_cols=3, matcher=None):
+    matcher = matcher or DEFAULT_MATCHER
   
     items = [i for i in items if i["text"].strip()]  
-    for i in items[0:50]:
-        print(f"Item: x={i['x']:.1f} y={i['y']:.1f} text='{i['text']}'")
+    if logger.isEnabledFor(logging.DEBUG):
+        for i in items[0:50]:
+            logger.debug("Item: x=%.1f y=%.1f text='%s'", i["x"], i["y"], i["text"])
     # Hard filter weird outlier rows (usually margin trash)
     ys = [i["y"] for i in items]
     median_y = statistics.median(ys)
@@ -246,43 +257,12 @@ def detect_headings(items, y_tol=10, x_merge_tol=8, min_cols=3):
         items = [i for i in items if i["text"].strip()]
 
 
-    items_sorted = sorted(items, key=lambda i: i["y"])
-    rows = []
-
-    for item in items_sorted:
-        for row in rows:
-            if abs(row["y"] - item["y"]) <= y_tol:
-                row["items"].append(item)
-                break
-        else:
-            rows.append({"y": item["y"], "items": [item]})
-
-    merged_rows = []
-    i = 0
-
-    while i < len(rows):
-        curr = rows[i]
-        if i + 1 < len(rows) and abs(rows[i + 1]["y"] - curr["y"]) <= y_tol:
-            nxt = rows[i + 1]
-            # merge
-            combined = curr["items"] + nxt["items"]
-            merged_rows.append({"y": curr["y"], "items": combined})
-            i += 2
-        else:
-            merged_rows.append(curr)
-            i += 1
-
-
-    HEADER_KEYWORDS = [
-        "date", "posting date", "transaction", "transaction date", "description",
-        "money in", "money out", "balance", "payments",
-        "deposits", "credit", "debit", "amount", "post date"
-    ]
+    rows = cluster_rows(items, y_tol)
 
     scored = []
-    for row in merged_rows:
+    for row in rows:
         txt = " ".join(it["text"].lower() for it in row["items"])
-        hits = sum(1 for k in HEADER_KEYWORDS if k in txt)
+        hits = matcher.hits(txt)
         spread = (
             max(it["x"] for it in row["items"])
             - min(it["x"] for it in row["items"])
@@ -304,18 +284,16 @@ def detect_headings(items, y_tol=10, x_merge_tol=8, min_cols=3):
         if s["cols"] >= min_cols and s["word_count"] <= 20
     ]
 
-    print("Candidate row y-coordinates:")
-    for c in candidates:
-        print(c["row"]["y"])
+    logger.debug("Candidate row y-coordinates: %s", [c["row"]["y"] for c in candidates])
 
     if not candidates:
-        print("No valid header candidates found.")
+        logger.debug("No valid header candidates found.")
         return None
 
     candidates.sort(key=lambda s: (s["hits"], s["spread"]), reverse=True)
     best = candidates[0]["row"]
 
-    print(f"Selected heading row at y={best['y']}")
+    logger.debug("Selected heading row at y=%s", best["y"])
 
     merged = merge_wrapped_headers(best["items"])
 
@@ -325,7 +303,47 @@ def detect_headings(items, y_tol=10, x_merge_tol=8, min_cols=3):
     "headings": merged      
     }
 
-def find_heading_row(items, chunk_size=3000):
+def table_layouts(headings, matcher=None):
+    """
+    Split a heading row into the tables laid out side by side on the page.
+    Returns a list of tables, each a list of (role, x) columns left to right;
+    headings without a column role are left out.
+    A new table starts at a date column that follows a non-date one
+    ("Posting Date | Transaction Date" stay together). The row only counts
+    as several tables when every part starts with a date column and has the
+    same set of roles, i.e. the column sequence repeats.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+
+    tables = []
+    prev = None
+    for h in sorted(headings, key=lambda h: h["x"]):
+        role = matcher.role(h["text"].lower())
+        if role is None:
+            continue
+        if not tables or (role == "date" and prev != "date"):
+            tables.append([])
+        tables[-1].append((role, h["x"]))
+        prev = role
+
+    if len(tables) > 1:
+        roles = [{role for role, _ in t} for t in tables]
+        repeated = all(t[0][0] == "date" for t in tables) and all(r == roles[0] for r in roles)
+        if not repeated or len(roles[0]) < 2:
+            tables = [[c for t in tables for c in t]]
+
+    return tables
+
+def find_heading_row(items, chunk_size=3000, matcher=None):
+    matcher = matcher or DEFAULT_MATCHER
+
+    # Headers nearly always sit near the top: try that first, and only
+    # score every row of the page when no row is a clear header
+    header_info = find_header_top_down(items, matcher=matcher)
+    if header_info is not None:
+        logger.debug("Heading row found top-down at y=%s", header_info["y"])
+        header_info["tables"] = table_layouts(header_info["headings"], matcher=matcher)
+        return header_info
 
     chunks = []
     for i in range(0, len(items), chunk_size):
@@ -333,22 +351,16 @@ def find_heading_row(items, chunk_size=3000):
 
     all_candidates = []
 
-    HEADER_KEYWORDS = [
-        "date", "posting date", "transaction", "description",
-        "money in", "money out", "balance", "payments",
-        "deposits", "credit", "debit", "amount", "post date"
-    ]
-
     # store: chunk_index -> {"headings": [...], "y": y_value}
     chunk_headings = {}
 
     for idx, chunk in enumerate(chunks):
-        print(f"\n--- Checking chunk {idx+1}/{len(chunks)} ---")
+        logger.debug("Checking chunk %d/%d", idx + 1, len(chunks))
 
-        result = detect_and_merge_headers(chunk)
+        result = detect_and_merge_headers(chunk, matcher=matcher)
 
         if not result:
-            print("No headings found in this chunk.")
+            logger.debug("No headings found in this chunk.")
             continue
 
         y_val = result["y"]
@@ -362,7 +374,7 @@ def find_heading_row(items, chunk_size=3000):
         # score each heading
         for h in headings:
             txt = h["text"].lower()
-            hits = sum(1 for k in HEADER_KEYWORDS if k in txt)
+            hits = matcher.hits(txt)
             spread = h["x"]
 
             all_candidates.append({
@@ -373,7 +385,7 @@ def find_heading_row(items, chunk_size=3000):
             })
 
     if not all_candidates:
-        print("No headings detected in any chunk.")
+        logger.debug("No headings detected in any chunk.")
         return {
             "headings": None,
             "y": None
@@ -385,54 +397,110 @@ def find_heading_row(items, chunk_size=3000):
     best_heading = best["heading"]
     best_chunk = best["chunk_index"]
 
-    print("Headings found in best chunk:")
-    for h in chunk_headings[best_chunk]["headings"]:
-        print(f"    x={h['x']:.1f}  '{h['text']}'")
+    if logger.isEnabledFor(logging.DEBUG):
+        for h in chunk_headings[best_chunk]["headings"]:
+            logger.debug("Heading in best chunk: x=%.1f '%s'", h["x"], h["text"])
 
     best_y = chunk_headings[best_chunk]["y"]
-    print(f"Selected heading row y={best_y}")
+    logger.debug("Selected heading row y=%s", best_y)
 
+    headings = chunk_headings[best_chunk]["headings"]
     return {
-        "headings": chunk_headings[best_chunk]["headings"],
-        "y": best_y
+        "headings": headings,
+        "y": best_y,
+        "tables": table_layouts(headings, matcher=matcher)
     }
 
-def extract_transactions_with_dates(items, header_info):
+def build_column_index(columns, x_tol=50):
+    """
+    Build a column index sorted by heading x.
+    columns is a list of (role, key, x, table). Each column accepts items
+    within [x - x_tol, x + x_tol] (amounts are left-aligned under their
+    heading, so [x, x + x_tol]).
+    Returns (xs, cols) for use with find_column.
+    """
+    xs = []
+    cols = []
+    for role, key, x, table in sorted(columns, key=lambda c: c[2]):
+        lo = x if role == "amount" else x - x_tol
+        xs.append(x)
+        cols.append((lo, x + x_tol, role, key, table))
+
+    return xs, cols
+
+def find_column(xs, cols, x):
+    """
+    Return (role, key, table) of the column an item at x belongs to, or None.
+    Only the two headings either side of x are considered, nearest first,
+    so overlapping windows resolve to the closest column instead of
+    whichever was checked first.
+    """
+    pos = bisect_left(xs, x)
+    if pos == 0:
+        candidates = (0,)
+    elif pos == len(xs):
+        candidates = (pos - 1,)
+    elif x - xs[pos - 1] <= xs[pos] - x:
+        candidates = (pos - 1, pos)
+    else:
+        candidates = (pos, pos - 1)
+
+    for c in candidates:
+        lo, hi, role, key, table = cols[c]
+        if lo <= x <= hi:
+            return role, key, table
+    return None
+
+def table_columns(tables):
+    """
+    (role, key, x, table) for every column, as used by build_column_index.
+    A single table keys its columns date1, date2, description1, ...; with
+    side-by-side tables each one gets its own plain date, description, ...
+    keys (a repeated role within a table becomes amount2, ...), and
+    their transactions carry a "table" index to tell them apart.
+    """
+    columns = []
+    for t, table in enumerate(tables):
+        seen = Counter()
+        for role, x in table:
+            seen[role] += 1
+            if len(tables) == 1:
+                key = f"{role}{seen[role]}"
+            else:
+                key = role if seen[role] == 1 else f"{role}{seen[role]}"
+            columns.append((role, key, x, t))
+
+    # Keys in role order, like the old per-role column lists
+    order = {"date": 0, "description": 1, "amount": 2, "balance": 3}
+    columns.sort(key=lambda c: (c[3], order.get(c[0], len(order))))
+    return columns
+
+def extract_transactions_with_dates(items, header_info, matcher=None):
+    with metrics.stage("extract_transactions_with_dates", pages=1, rows=0) as counts:
+        transactions = _extract_transactions_with_dates(items, header_info, matcher, counts)
+        counts["transactions"] = len(transactions)
+    return transactions
+
+def _extract_transactions_with_dates(items, header_info, matcher, counts):
     if not header_info or not header_info.get("headings"):
         return []
 
-    headings = header_info["headings"]
     header_y = header_info["y"]
     page_number = header_info["page_number"]
 
-    DATE_KEYWORDS = ["date", "posting date", "post date", "value date"]
-    DESC_KEYWORDS = ["description", "transaction", "details", "narrative"]
-    AMT_KEYWORDS = ["amount", "debit", "credit", "money in", "money out", "payments", "deposits"]
-    BAL_KEYWORDS = ["balance", "available balance", "account balance"]
-
-    # Identify date columns and description columns
-    date_columns = []
-    desc_columns = []
-    amount_columns = []
-    balance_columns = []
-
-    for h in headings:
-        txt = h["text"].lower()
-        if any(k in txt for k in DATE_KEYWORDS):
-            date_columns.append(h["x"])
-        elif any(k in txt for k in DESC_KEYWORDS):
-            desc_columns.append(h["x"])
-        elif any(k in txt for k in AMT_KEYWORDS):
-            amount_columns.append(h["x"])
-        elif any(k in txt for k in BAL_KEYWORDS):
-            balance_columns.append(h["x"])
-
-    if not date_columns:
-        print("No date columns found in header")
+    # Column layout comes from find_heading_row; cached layouts work it out here
+    tables = header_info.get("tables") or table_layouts(header_info["headings"], matcher=matcher)
+
+    if not any(role == "date" for table in tables for role, _ in table):
+        logger.debug("No date columns found in header")
         return []
 
     x_tol = 50
 
+    columns = table_columns(tables)
+    table_keys = [[key for _, key, _, t in columns if t == i] for i in range(len(tables))]
+    xs, cols = build_column_index(columns, x_tol=x_tol)
+
     # Filter page items below the header row
     data_items = [
         i for i in items
@@ -444,82 +512,128 @@ def extract_transactions_with_dates(items, header_info):
     for it in data_items:
         y_rounded = round(it["y"], 1)
         rows.setdefault(y_rounded, []).append(it)
+    counts["rows"] = len(rows)
 
     transactions = []
 
     for y, row_items in sorted(rows.items()):
-        row_data = {}
-
-        # Extract dates
+        # One row dict per table, so side-by-side tables come out as separate transactions
+        row_data = [dict.fromkeys(keys) for keys in table_keys]
         has_date = False
-        for idx, x_col in enumerate(date_columns, start=1):
-            col_key = f"date{idx}"
-            row_data[col_key] = None
-            for it in row_items:
-                if abs(it["x"] - x_col) <= x_tol and is_valid_date(it["text"]):
-                    row_data[col_key] = it["text"].strip()
-                    has_date = True
-                    break
+
+        # One pass: drop each item into the nearest column that accepts it
+        for it in row_items:
+            col = find_column(xs, cols, it["x"])
+            if col is None:
+                continue
+
+            role, key, table = col
+            if row_data[table][key] is not None:
+                continue  # first item in the column wins
+
+            text = it["text"].strip()
+            if role == "date":
+                if not is_valid_date(text):
+                    continue
+                has_date = True
+
+            row_data[table][key] = text
 
         # Skip row if no valid date
         if not has_date:
             continue
 
-        # Extract descriptions
-        for idx, x_col in enumerate(desc_columns, start=1):
-            col_key = f"description{idx}"
-            row_data[col_key] = None
-            for it in row_items:
-                if abs(it["x"] - x_col) <= x_tol:
-                    row_data[col_key] = it["text"].strip()
-                    break
-
-        for idx, x_col in enumerate(amount_columns, start=1):
-            col_key = f"amount{idx}"
-            row_data[col_key] = None
-            for it in row_items:
-                if 0 <= (it["x"] - x_col) <= x_tol:
-                    row_data[col_key] = it["text"].strip()
-                    break
-        
-        for idx, x_col in enumerate(balance_columns, start=1):
-            col_key = f"balance{idx}"
-            row_data[col_key] = None
-            for it in row_items:
-                if abs(it["x"] - x_col) <= x_tol:
-                    row_data[col_key] = it["text"].strip()
-                    break
-
-        transactions.append(row_data)
-        
-    transactions = split_if_two_tables(transactions)
+        if len(row_data) == 1:
+            transactions.append(row_data[0])
+        else:
+            # Left table first; a table with nothing on this row adds nothing.
+            # Both tables use the same keys, so tag each row with its table
+            transactions.extend(
+                dict(r, table=t) for t, r in enumerate(row_data) if any(r.values())
+            )
+
     return transactions
 
-def general_parse_statement(items, chunk_size=3000):
-    print("\n=== PARSING STARTED ===")
+def transaction_field(tx, role):
+    """
+    Value of a column role ("date", "amount", ...) in a transaction.
+    general_parse_statement keys columns as date1, amount2, ...; the first
+    filled one wins.
+    """
+    if tx.get(role):
+        return tx[role]
+    for key in sorted(tx):
+        if key.startswith(role) and key[len(role):].isdigit() and tx[key]:
+            return tx[key]
+    return None
+
+def detect_page_header(page_items, chunk_size=3000, layout_cache=None, matcher=None):
+    """
+    Header for one page: a cached layout if one fits, else find_heading_row.
+    """
+    with metrics.stage("find_heading_row", pages=1, items=len(page_items)):
+        header_info = None
+        if layout_cache is not None:
+            header_info = layout_cache.match(page_items)
+
+        if header_info is None:
+            header_info = find_heading_row(page_items, chunk_size=chunk_size, matcher=matcher)
+            if layout_cache is not None:
+                layout_cache.add(header_info)
 
-    pages = group_items_by_page(items)
-    all_transactions = []
-    all_headings = {}
+    return header_info
+
+def iter_parse_pages(pages, chunk_size=3000, layout_cache=None, matcher=None):
+    """
+    Streaming counterpart of general_parse_statement.
+    Takes an iterable of (page_number, page_items) - e.g. straight from
+    iter_text_pymupdf - and yields (page_number, header_info, transactions)
+    as soon as each page is parsed.
+    If a LayoutCache is given, known header layouts are tried first and
+    find_heading_row only runs when none of them fit.
+    matcher is a keywords.KeywordMatcher for banks with their own vocabulary.
+    """
+    for pg, page_items in pages:
+        if not page_items:
+            continue
 
-    for pg, page_items in sorted(pages.items()):
-        print(f"\n--- Parsing page {pg} ---")
-        header_info = find_heading_row(page_items, chunk_size=chunk_size)
+        logger.debug("Parsing page %s", pg)
+        header_info = detect_page_header(page_items, chunk_size=chunk_size, layout_cache=layout_cache, matcher=matcher)
 
         if not header_info:
-            print(f"No headings on page {pg}, skipping.")
+            logger.debug("No headings on page %s, skipping.", pg)
             continue
 
         # Add page_number to header_info for downstream use
         header_info["page_number"] = pg
-        all_headings[pg] = header_info
-        transactions = extract_transactions_with_dates(page_items, header_info)
-        all_transactions.extend(transactions)
+        transactions = extract_transactions_with_dates(page_items, header_info, matcher=matcher)
+        yield pg, header_info, transactions
+
+def general_parse_statement(items, chunk_size=3000, layout_cache=None, matcher=None):
+    logger.info("=== PARSING STARTED ===")
+
+    with metrics.stage("general_parse_statement", items=len(items)) as counts:
+        pages = group_items_by_page(items)
+        all_transactions = []
+        all_headings = {}
+        # Transactions per page, so consumers can pair them back up with their page's header
+        transaction_counts = {}
+
+        for pg, header_info, transactions in iter_parse_pages(
+            sorted(pages.items()), chunk_size=chunk_size, layout_cache=layout_cache, matcher=matcher
+        ):
+            all_headings[pg] = header_info
+            transaction_counts[pg] = len(transactions)
+            all_transactions.extend(transactions)
+
+        counts["pages"] = len(pages)
+        counts["transactions"] = len(all_transactions)
 
-    print("\n=== PARSING COMPLETE ===")
-    print(f"Total transactions found: {len(all_transactions)}")
+    logger.info("=== PARSING COMPLETE ===")
+    logger.info("Total transactions found: %d", len(all_transactions))
 
     return {
         "transactions": all_transactions,
         "headings": all_headings,
+        "transaction_counts": transaction_counts,
     }
@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+from dates import normalize_date
+from extract_pymupdf import extract_text_pymupdf
+from general_parse_statement import general_parse_statement, transaction_field
+
+# Opening-balance rows repeat the previous statement's closing balance; they aren't transactions
+BROUGHT_FORWARD_RE = re.compile(
+    r"\b(?:balance\s+)?(?:brought|b/)\s*f(?:or)?w?(?:ar)?d?\b|\bopening\s+balance\b",
+    re.IGNORECASE,
+)
+
+
+def is_brought_forward(tx):
+    description = transaction_field(tx, "description")
+    return bool(description and BROUGHT_FORWARD_RE.search(description))
+
+
+def transaction_key(tx):
+    """
+    Normalised (date, amount, description, balance) tuple so the same row
+    reads the same from different statements ("6 Oct 25" == "06/10/2025",
+    "1,200.00" == "1200.00", whitespace in descriptions ignored).
+    """
+    date = transaction_field(tx, "date") or ""
+    amount = transaction_field(tx, "amount") or ""
+    description = transaction_field(tx, "description") or ""
+    balance = transaction_field(tx, "balance") or ""
+
+    return (
+        normalize_date(date) or date.strip(),
+        amount.replace(",", "").replace(" ", ""),
+        " ".join(description.lower().split()),
+        balance.replace(",", "").replace(" ", ""),
+    )
+
+
+def fingerprints(transactions):
+    """
+    Yield (fingerprint, transaction) for each transaction.
+    Identical rows within one statement (two R50 coffees on the same day
+    with no balance column) get an occurrence number in their key, so they
+    stay distinct from each other but still match the same rows when an
+    overlapping statement is ingested later.
+    """
+    seen = Counter()
+    for tx in transactions:
+        key = transaction_key(tx)
+        seen[key] += 1
+        raw = "\x1f".join(key) + f"\x1f{seen[key]}"
+        yield hashlib.sha1(raw.encode()).hexdigest(), tx
+
+
+class AccountIndex:
+    """
+    Persistent per-account store of ingested transactions.
+
+    Each account gets two append-only files in index_dir:
+        <account>.idx    one transaction fingerprint per line
+        <account>.jsonl  the transactions themselves, in ingestion order
+    An account's fingerprints are loaded into a set the first time it's
+    used; after that merging a statement only hashes and appends its new
+    rows, it never rescans the account's history.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self._seen = {}
+        os.makedirs(index_dir, exist_ok=True)
+
+    def _path(self, account, ext):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", account)
+        return os.path.join(self.index_dir, f"{safe}.{ext}")
+
+    def fingerprints(self, account):
+        if account not in self._seen:
+            seen = set()
+            try:
+                with open(self._path(account, "idx")) as f:
+                    seen.update(line.strip() for line in f if line.strip())
+            except FileNotFoundError:
+                pass
+            self._seen[account] = seen
+        return self._seen[account]
+
+    def merge(self, account, transactions):
+        """
+        Append the transactions this account hasn't seen yet and return them.
+        Brought-forward balance rows are dropped.
+        """
+        seen = self.fingerprints(account)
+
+        new = []
+        new_keys = []
+        for fp, tx in fingerprints(t for t in transactions if not is_brought_forward(t)):
+            if fp in seen:
+                continue
+            seen.add(fp)
+            new.append(tx)
+            new_keys.append(fp)
+
+        if new:
+            # Ledger first: a crash in between leaves rows without index entries,
+            # which only means they'd be re-appended, never lost
+            with open(self._path(account, "jsonl"), "a") as f:
+                f.writelines(json.dumps(tx) + "\n" for tx in new)
+            with open(self._path(account, "idx"), "a") as f:
+                f.writelines(fp + "\n" for fp in new_keys)
+
+        return new
+
+    def transactions(self, account):
+        try:
+            with open(self._path(account, "jsonl")) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+
+def ingest_statement(path, account, index, parse=None):
+    """
+    Parse one statement PDF and merge it into account's index.
+    Returns the transactions that were new.
+    """
+    if parse is None:
+        parsed = general_parse_statement(extract_text_pymupdf(path))
+    else:
+        parsed = parse(path)
+    return index.merge(account, parsed["transactions"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add statements to an account's transaction history, skipping ones already seen.")
+    parser.add_argument("statements", nargs="+", help="statement PDFs, oldest first")
+    parser.add_argument("-a", "--account", required=True, help="account the statements belong to")
+    parser.add_argument("-i", "--index-dir", default="ledger", help="where account histories are kept (default: ledger)")
+    args = parser.parse_args(argv)
+
+    index = AccountIndex(args.index_dir)
+    for path in args.statements:
+        new = ingest_statement(path, args.account, index)
+        print(f"{path}: {len(new)} new transactions", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import re
+
+# Words that make a row look like a table heading
+HEADER_KEYWORDS = [
+    "date", "posting date", "transaction", "description",
+    "money in", "money out", "balance", "payments",
+    "deposits", "credit", "debit", "amount", "post date"
+]
+
+# Column roles, in priority order: a heading matching several roles takes the first
+ROLE_KEYWORDS = {
+    "date": ["date", "posting date", "post date", "value date"],
+    "description": ["description", "transaction", "details", "narrative"],
+    "amount": ["amount", "debit", "credit", "money in", "money out", "payments", "deposits"],
+    "balance": ["balance", "available balance", "account balance"],
+}
+
+# Amount headings for money leaving the account; unsigned values under them are debits
+OUTFLOW_KEYWORDS = ["money out", "debit", "payments", "withdrawal", "geld uit", "debiet", "betalings"]
+
+# Extra per-bank / per-language vocabularies for KeywordMatcher.extend()
+AFRIKAANS = {
+    "header": [
+        "datum", "transaksie", "beskrywing", "bedrag", "saldo",
+        "debiet", "krediet", "betalings", "deposito's", "geld in", "geld uit",
+    ],
+    "roles": {
+        "date": ["datum", "transaksiedatum", "boekingsdatum"],
+        "description": ["beskrywing", "transaksie", "besonderhede"],
+        "amount": ["bedrag", "debiet", "krediet", "betalings", "deposito's", "geld in", "geld uit"],
+        "balance": ["saldo", "beskikbare saldo"],
+    },
+}
+
+
+def _trie_pattern(words):
+    # Factor the keywords into a prefix tree so the regex engine only
+    # follows one branch per start position instead of trying every word
+    tree = {}
+    for word in words:
+        node = tree
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        ends_here = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not ends_here else "(?:" + "|".join(branches) + ")"
+        # Optional tail for words that are a prefix of longer ones; greedy, so longest wins
+        return "(?:" + body + ")?" if ends_here else body
+
+    return build(tree)
+
+
+class KeywordMatcher:
+    """
+    Finds header and column-role keywords in one regex pass over a row's text.
+
+    score(txt) returns (hits, role) where hits is the number of distinct
+    header keywords contained in txt (same count as checking each keyword
+    with `in`) and role is the first column role matched, or None.
+    Text is expected to be lower-case already.
+    """
+
+    def __init__(self, header_keywords=HEADER_KEYWORDS, role_keywords=ROLE_KEYWORDS):
+        self.header_keywords = list(header_keywords)
+        self.role_keywords = {role: list(words) for role, words in role_keywords.items()}
+
+        vocab = set(self.header_keywords)
+        for words in self.role_keywords.values():
+            vocab.update(words)
+
+        header_set = set(self.header_keywords)
+        role_order = list(self.role_keywords)
+
+        # Matches don't overlap, so a match also stands for every keyword it
+        # contains ("posting date" -> "date") - precompute that per keyword
+        self._implied = {}
+        for word in vocab:
+            contained = [k for k in vocab if k in word]
+            header = frozenset(k for k in contained if k in header_set)
+            roles = frozenset(
+                role_order.index(role)
+                for role, words in self.role_keywords.items()
+                if any(k in words for k in contained)
+            )
+            self._implied[word] = (header, roles)
+
+        self._role_order = role_order
+        self._pattern = re.compile(_trie_pattern(sorted(vocab)))
+
+    def extend(self, vocabulary):
+        """
+        Return a new matcher that also knows vocabulary's words, given as
+        {"header": [...], "roles": {"date": [...], ...}} (see AFRIKAANS).
+        """
+        header = self.header_keywords + [k for k in vocabulary.get("header", []) if k not in self.header_keywords]
+        roles = {role: list(words) for role, words in self.role_keywords.items()}
+        for role, words in vocabulary.get("roles", {}).items():
+            roles.setdefault(role, [])
+            roles[role] += [w for w in words if w not in roles[role]]
+        return KeywordMatcher(header, roles)
+
+    def matches(self, txt):
+        """
+        Set of header keywords found in txt.
+        """
+        found = set()
+        for word in self._pattern.findall(txt):
+            found |= self._implied[word][0]
+        return found
+
+    def score(self, txt):
+        header = set()
+        roles = set()
+        for word in self._pattern.findall(txt):
+            h, r = self._implied[word]
+            header |= h
+            roles |= r
+
+        role = self._role_order[min(roles)] if roles else None
+        return len(header), role
+
+    def hits(self, txt):
+        return self.score(txt)[0]
+
+    def role(self, txt):
+        return self.score(txt)[1]
+
+
+DEFAULT_MATCHER = KeywordMatcher()
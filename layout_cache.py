@@ -0,0 +1,117 @@
+import json
+import os
+
+from keywords import DEFAULT_MATCHER
+
+
+def header_keywords(headings, matcher=None):
+    """
+    Header keywords present in a set of headings, sorted.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+    txt = " ".join(h["text"] for h in headings).lower()
+    return sorted(matcher.matches(txt))
+
+
+def fingerprint(header_info, x_round=5, matcher=None):
+    """
+    Stable key for a header layout: its keywords plus rounded column x-positions.
+    """
+    headings = header_info["headings"]
+    cols = ",".join(str(int(round(h["x"] / x_round)) * x_round) for h in headings)
+    return "|".join(header_keywords(headings, matcher)) + "@" + cols
+
+
+class LayoutCache:
+    """
+    Remembers header layouts (heading row y + column positions) so pages and
+    documents from the same bank can skip full header detection.
+
+    match() is a single scan over a page's items; only when no known template
+    fits does the caller fall back to find_heading_row and add() the result.
+    Pass path to load templates from / save() them to a JSON file.
+    """
+
+    def __init__(self, path=None, y_tol=6, x_tol=12, matcher=None):
+        self.path = path
+        self.matcher = matcher
+        self.y_tol = y_tol
+        self.x_tol = x_tol
+        self.templates = {}
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.templates = json.load(f)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def add(self, header_info):
+        if not header_info or not header_info.get("headings"):
+            return None
+
+        key = fingerprint(header_info, matcher=self.matcher)
+        self.templates[key] = {
+            "y": header_info["y"],
+            "headings": [{"x": h["x"], "text": h["text"], "y": h["y"]} for h in header_info["headings"]],
+            "keywords": header_keywords(header_info["headings"], self.matcher),
+        }
+        return key
+
+    def match(self, items):
+        """
+        Return header_info ({"headings", "y"}) for the first template whose
+        heading row is found on this page, or None.
+        """
+        for key, template in self.templates.items():
+            header_info = self._match_template(template, items)
+            if header_info:
+                # Move to the front so the bank we're currently parsing is tried first
+                self.templates = {key: template, **self.templates}
+                return header_info
+
+        return None
+
+    def _match_template(self, template, items):
+        y = template["y"]
+        row = [i for i in items if abs(i["y"] - y) <= self.y_tol]
+        if not row:
+            return None
+
+        # Every template column needs an item starting at (roughly) the same x
+        matched = []
+        for h in template["headings"]:
+            hit = next((i for i in row if abs(i["x"] - h["x"]) <= self.x_tol), None)
+            if hit is None:
+                return None
+            matched.append(hit)
+
+        txt = " ".join(i["text"] for i in row).lower()
+        if any(k not in txt for k in template["keywords"]):
+            return None
+
+        return {
+            "headings": [dict(h) for h in template["headings"]],
+            "y": min(i["y"] for i in matched),
+        }
+
+    def save(self, path=None):
+        """
+        Write the templates to path, merged with whatever other processes
+        (batch workers sharing one file) saved there since this cache loaded.
+        Two saves racing can still drop a template; it's just detected again.
+        """
+        path = path or self.path
+        if not path:
+            return
+
+        templates = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                templates = json.load(f)
+        templates.update(self.templates)
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(templates, f, indent=2)
+        os.replace(tmp, path)
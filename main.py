@@ -1,30 +1,98 @@
 import json
-from extract_pymupdf import extract_text_pymupdf
-from extract_pymupdf import extract_text_pymupdf_original
-from extract_pdfminer import extract_text_pdfminer
+import logging
+from extractors import get_extractor
 from parse_statement import parse_statement
 from general_parse_statement import general_parse_statement
+from general_parse_statement import iter_parse_pages
+from writers import open_writer
 
 # PDF_PATH = "CapeticPDF.pdf"
 PDF_PATH = "5 November 2025.pdf"
 
-# Run both extractors
-pymu_lines = extract_text_pymupdf(PDF_PATH)
-# pymu_lines = extract_text_pymupdf_original(PDF_PATH)
-# pdfminer_lines = extract_text_pdfminer(PDF_PATH)
+# Extractor backend: "pymupdf", "pdfminer_items", "auto" (PyMuPDF, pdfminer if that looks broken),
+# or the flat-text "pymupdf_text" / "pymupdf_lines" / "pdfminer", which go to the line-based
+# parse_statement instead. Only the chosen one is imported.
+BACKEND = "pymupdf"
 
-# Parse both versions
-pymu_parsed = general_parse_statement(pymu_lines)
-# pymu_parsed = parse_statement(pymu_lines)
-# pdfminer_parsed = general_parse_statement(pdfminer_lines)
+# Backends that return plain text lines rather than positioned items
+FLAT_BACKENDS = ("pymupdf_text", "pymupdf_lines", "pdfminer")
 
-# Save results
-output = {
-    "pymupdf_results": pymu_parsed,
-    # "pdfminer_results": pdfminer_parsed
-}
+# Worker processes used for page extraction (1 = serial)
+WORKERS = 1
 
-with open("statement.json", "w") as f:
-    json.dump(output, f, indent=2)
+# Streamed transaction output instead of statement.json, e.g. "statement.ndjson",
+# "statement.csv" or "statement.parquet" (format from the extension); None = statement.json
+OUTPUT_PATH = None
 
-print("Extraction complete → statement.json")
\ No newline at end of file
+# Also run the line-based parse_statement as a cross-check; both parsers share
+# one decode of the document (extract_items_and_lines)
+CROSS_CHECK = False
+
+
+def main():
+    # Progress messages from the parsers; use logging.DEBUG for per-page/per-line detail
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if OUTPUT_PATH:
+        # Pages are written as they're parsed; nothing is held beyond the current page
+        writer = open_writer(OUTPUT_PATH)
+        try:
+            for pg, header_info, transactions in iter_parse_pages(get_extractor("pymupdf_pages")(PDF_PATH)):
+                writer.write(PDF_PATH, transactions, page=pg, header_info=header_info)
+        finally:
+            writer.close()
+        print(f"Extraction complete → {OUTPUT_PATH}")
+        return
+
+    if CROSS_CHECK:
+        items, flat_lines = get_extractor("pymupdf_both")(PDF_PATH)
+        output = {
+            "pymupdf_results": general_parse_statement(items),
+            "line_parser_results": parse_statement(flat_lines),
+        }
+        with open("statement.json", "w") as f:
+            json.dump(output, f, indent=2)
+        print("Extraction complete → statement.json")
+        return
+
+    extract = get_extractor(BACKEND)
+
+    if BACKEND in FLAT_BACKENDS:
+        # No coordinates to find a header row with; parse the text line by line
+        output = {"line_parser_results": parse_statement(extract(PDF_PATH))}
+        with open("statement.json", "w") as f:
+            json.dump(output, f, indent=2)
+        print("Extraction complete → statement.json")
+        return
+
+    # Run the selected extractor
+    pymu_lines = extract(PDF_PATH, workers=WORKERS)
+    # pdfminer_lines = get_extractor("pdfminer_items")(PDF_PATH)
+
+    # Parse both versions
+    pymu_parsed = general_parse_statement(pymu_lines)
+    # pymu_parsed = parse_statement(get_extractor("pymupdf_lines")(PDF_PATH))  # flat-text statements, streamed
+    # pdfminer_parsed = general_parse_statement(pdfminer_lines)
+
+    # Streaming alternative: one page in memory at a time
+    # for pg, header_info, transactions in iter_parse_pages(get_extractor("pymupdf_pages")(PDF_PATH)):
+    #     ...
+    # or, clipped to the transaction table once its header is known:
+    # (import table_region here, not at the top, so main doesn't load fitz up front)
+    # for pg, header_info, transactions in table_region.iter_parse_pdf_roi(PDF_PATH):
+
+    # Save results
+    output = {
+        "pymupdf_results": pymu_parsed,
+        # "pdfminer_results": pdfminer_parsed
+    }
+
+    with open("statement.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print("Extraction complete → statement.json")
+
+
+# Guard needed so worker processes (spawned on macOS/Windows) don't re-run the script
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+
+# Callables invoked as hook(stage, seconds, counts) whenever a stage finishes
+_hooks = []
+
+
+def add_hook(hook):
+    """
+    Register hook(stage, seconds, counts) to receive stage timings.
+    counts is a dict such as {"pages": 1, "rows": 42, "transactions": 40}.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def stage(name, **counts):
+    """
+    Time a block of work. The yielded dict can be filled in with counts
+    (rows, transactions, ...) before the block ends.
+    With no hooks registered this costs two perf_counter calls.
+    """
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        if _hooks:
+            elapsed = time.perf_counter() - start
+            for hook in list(_hooks):
+                hook(name, elapsed, counts)
+
+
+class StageTimings:
+    """
+    Ready-made hook that totals time, calls and counts per stage.
+
+        timings = StageTimings()
+        metrics.add_hook(timings)
+        general_parse_statement(items)
+        print(timings.report())
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, name, seconds, counts):
+        entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        for key, value in counts.items():
+            if isinstance(value, (int, float)):
+                entry[key] = entry.get(key, 0) + value
+
+    def report(self):
+        lines = []
+        for name, entry in self.stages.items():
+            extra = "  ".join(f"{k}={v}" for k, v in entry.items() if k not in ("calls", "seconds"))
+            lines.append(f"{name:<34}{entry['calls']:>6} calls {entry['seconds']:>10.4f}s  {extra}")
+        return "\n".join(lines)
@@ -0,0 +1,14 @@
+def page_ranges(page_count, parts):
+    """
+    Split page indexes 0..page_count-1 into up to `parts` contiguous
+    (start, stop) ranges of near-equal size, in page order.
+    """
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
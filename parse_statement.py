@@ -1,5 +1,13 @@
 import re
-from datetime import datetime
+import logging
+
+import metrics
+from dates import normalize_date, to_date
+
+logger = logging.getLogger(__name__)
+
+# Transaction lines start with a bare "21 Oct 25" / "21 Oct" date
+TRANSACTION_DATE_RE = re.compile(r"^\d{2} [A-Za-z]{3}( \d{2})?$")
 
 def is_number(value):
     try:
@@ -9,94 +17,164 @@ def is_number(value):
         return False
 
 
-def parse_statement(lines):
-    statement_metadata = {}
-    statement_summarydata = {}
-    transactions = []
-
-    print(f"\n=== PARSING STARTED ===")
-
-        # First pass: get metadata
-    for i, line in enumerate(lines[:50]):  # Only check first 50 lines
-        line = line.strip()
-        if line.startswith("From:"):
-            date = line.replace("From:", "").strip()
-            parsed = datetime.strptime(date, "%d %b %y")
-            formattedDate = parsed.strftime("%Y-%m-%d")
-
-            statement_metadata["period_from"] = formattedDate
-            
-        elif line.startswith("To:"):
-
-            date = line.replace("To:", "").strip()
-            parsed = datetime.strptime(date, "%d %b %y")
-            formattedDate = parsed.strftime("%Y-%m-%d")
-
-            statement_metadata["period_to"] = formattedDate
-            statement_metadata["statement_date"] = statement_metadata["period_to"]
-
-    for i, line in enumerate(lines):
-        print(f"Line {i}: {line}")
-        if re.match(r"^\d{2} [A-Za-z]{3}( \d{2})?$", line):
-            
-            date = line
-            parsed = datetime.strptime(date, "%d %b %y")
-            formattedDate = parsed.strftime("%Y-%m-%d")
-
-            description = lines[i + 1].strip()
-
-            numberStorage = []
-            debit = 0
-            credit = 0
-            
-            for offset in range(3, 6):  # i+3, i+4, i+5
-                candidate = lines[i + offset].strip().replace(",", "")
-                if is_number(candidate):
-                    numberStorage.append(float(candidate))
-            
-            for i in range(len(numberStorage)-1):
-                if numberStorage[i] > 0:
-                    credit = numberStorage[i]
-                
-                elif numberStorage[i] < 0:
-                    debit = numberStorage[i]
-
-            balance = numberStorage[-1]
-
-            transactions.append({
-                "date": formattedDate,
-                "description": description,
-                "debit": debit,
-                "credit": credit,
-                "raw_balance": balance
-            })
-
-    for i, line in enumerate(lines[-20:]):
-        if line.startswith("Statement Summary"):
-            next_index = i + 1
-            if next_index < len(lines[-20:]):
-                statement_summarydata["Payments"] = float(lines[-20:][next_index + 1]
-                        .strip()
-                        .replace(",", "")
-                        .replace("R", "")
-                )
+# Only the top of the statement carries the From:/To: period
+METADATA_LINES = 50
+# The statement summary is expected within the last few lines
+SUMMARY_LINES = 20
+# Description is the line after the date; amounts/balance are 3-5 lines after it
+DESCRIPTION_OFFSET = 1
+NUMBER_OFFSETS = range(3, 6)
+LAST_OFFSET = NUMBER_OFFSETS[-1]
+# Payments and deposits sit 2 and 4 lines below "Statement Summary"
+SUMMARY_OFFSETS = {2: "Payments", 4: "Deposits"}
 
-                statement_summarydata["Deposits"] = float(lines[-20:][next_index + 3]
-                        .strip()
-                        .replace(",", "")
-                        .replace("R", "")
-                )
+PERIOD_RE = re.compile(r"^(From|To):")
 
-   
-    
-    print(f"\n=== PARSING COMPLETE ===")
 
+def parse_statement(lines):
+    """
+    Parse a flat-text (Capitec-style) statement. lines can be any iterable,
+    e.g. a generator straight from iter_lines_pymupdf; it is read once.
+    """
+    with metrics.stage("parse_statement") as counts:
+        parser = StatementParser()
+        for line in lines:
+            parser.feed(line)
+        result = parser.finish()
+        counts["lines"] = parser.line_count
+        counts["transactions"] = len(result["transactions"])
+    return result
+
+
+class StatementParser:
+    """
+    Single-pass state machine over the lines of a flat-text statement.
+
+    Every line is fed once: metadata is picked up from the first
+    METADATA_LINES lines, each transaction date opens a small window that
+    collects its description and amounts from the next LAST_OFFSET lines,
+    and the latest "Statement Summary" block is kept until the end decides
+    whether it fell within the last SUMMARY_LINES lines. Nothing but the
+    open windows and the output is held in memory.
+    """
+
+    def __init__(self):
+        self.line_count = 0
+        self.statement_metadata = {}
+        self.transactions = []
+        self.period_from = None
+        self.period_to = None
+
+        self._open = []       # transaction windows still collecting lines
+        self._summary = None  # (line number, values) of the latest summary block
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+
+        logger.info("=== PARSING STARTED ===")
+
+    def feed(self, line):
+        i = self.line_count
+        self.line_count += 1
+        if self._debug:
+            logger.debug("Line %d: %s", i, line)
+
+        if i < METADATA_LINES:
+            self._metadata(line.strip())
+
+        if self._open:
+            self._collect(i, line)
+
+        if TRANSACTION_DATE_RE.match(line):
+            self._open.append({"start": i, "date": line, "description": None, "numbers": []})
+
+        if self._summary is not None:
+            start, values = self._summary
+            name = SUMMARY_OFFSETS.get(i - start)
+            if name:
+                try:
+                    values[name] = float(line.strip().replace(",", "").replace("R", ""))
+                except ValueError:
+                    pass
 
-
-    print(f"Total transactions found: {len(transactions)}")
-
-    return {
-        "statement_metadata": statement_metadata,
-        "transactions": transactions,
-        "statement_summarydata": statement_summarydata
-    }
\ No newline at end of file
+        if line.startswith("Statement Summary"):
+            self._summary = (i, {})
+
+    def _metadata(self, line):
+        m = PERIOD_RE.match(line)
+        if not m:
+            return
+
+        formattedDate = normalize_date(line[m.end():].strip())
+        if m.group(1) == "From":
+            self.statement_metadata["period_from"] = formattedDate
+            self.period_from = to_date(formattedDate)
+        else:
+            self.statement_metadata["period_to"] = formattedDate
+            self.statement_metadata["statement_date"] = formattedDate
+            self.period_to = to_date(formattedDate)
+
+    def _collect(self, i, line):
+        still_open = []
+        for tx in self._open:
+            offset = i - tx["start"]
+            if offset == DESCRIPTION_OFFSET:
+                tx["description"] = line.strip()
+            elif offset in NUMBER_OFFSETS:
+                candidate = line.strip().replace(",", "")
+                if is_number(candidate):
+                    tx["numbers"].append(float(candidate))
+
+            if offset < LAST_OFFSET:
+                still_open.append(tx)
+            else:
+                self._close(tx)
+        self._open = still_open
+
+    def _close(self, tx):
+        # Yearless dates are resolved against the From:/To: period, which
+        # statements print at the top, ahead of the first transaction
+        formattedDate = normalize_date(tx["date"], self.period_from, self.period_to)
+        if formattedDate is None:
+            return
+
+        numberStorage = tx["numbers"]
+        if not numberStorage:
+            logger.debug("No amounts after %s on line %d, skipping", tx["date"], tx["start"])
+            return
+
+        debit = 0
+        credit = 0
+        # Every number but the last is an amount; the last one is the balance
+        for n in numberStorage[:-1]:
+            if n > 0:
+                credit = n
+            elif n < 0:
+                debit = n
+
+        self.transactions.append({
+            "date": formattedDate,
+            "description": tx["description"],
+            "debit": debit,
+            "credit": credit,
+            "raw_balance": numberStorage[-1]
+        })
+
+    def finish(self):
+        # Statements that end mid-transaction: close what we have
+        for tx in self._open:
+            self._close(tx)
+        self._open = []
+
+        statement_summarydata = {}
+        if self._summary is not None:
+            start, values = self._summary
+            if start >= self.line_count - SUMMARY_LINES:
+                statement_summarydata = values
+
+        logger.info("=== PARSING COMPLETE ===")
+        logger.info("Total transactions found: %d", len(self.transactions))
+
+        return {
+            "statement_metadata": self.statement_metadata,
+            "transactions": self.transactions,
+            "statement_summarydata": statement_summarydata
+        }
@@ -0,0 +1,141 @@
+import io
+import mmap
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+# Picklable handle to a PDF held in shared memory (see SharedPDF)
+SharedRef = namedtuple("SharedRef", ["name", "size"])
+
+
+def as_source(source):
+    """
+    Normalise an extractor input without copying it:
+    paths (str / os.PathLike) come back as str, in-memory PDFs (bytes,
+    bytearray, memoryview, mmap, BytesIO) as a memoryview over the
+    caller's buffer. Other binary file objects are read once.
+    SharedRef handles are passed through for attach().
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, SharedRef):
+        return source
+    if isinstance(source, memoryview):
+        return source.cast("B") if source.format != "B" or source.ndim != 1 else source
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        return memoryview(source)
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return memoryview(source.read())
+
+    raise TypeError(f"Can't read a PDF from {type(source).__name__}")
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable read-only file object over a memoryview, for libraries that
+    want a file (pdfminer). Only the bytes asked for are copied out.
+    close() releases the reader's own view of the buffer, so the caller
+    can close an mmap straight away even if the library keeps the reader.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        self.pos = 0
+
+    def close(self):
+        self.buffer.release()
+        super().close()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        else:
+            self.pos = len(self.buffer) + offset
+        self.pos = max(self.pos, 0)
+        return self.pos
+
+    def readinto(self, b):
+        chunk = self.buffer[self.pos : self.pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self.pos += n
+        return n
+
+
+class SharedPDF:
+    """
+    An in-memory PDF copied once into shared memory, so pool workers can
+    open it by name (self.ref) instead of each receiving a pickled copy.
+
+        with SharedPDF(data) as shared:
+            pool.submit(work, shared.ref, ...)
+    """
+
+    def __init__(self, buffer):
+        size = len(buffer)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.shm.buf[:size] = buffer
+        self.ref = SharedRef(self.shm.name, size)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def shared_source(source):
+    """
+    What to hand to pool workers for source: paths as-is (each worker
+    opens the file), in-memory PDFs as the SharedRef of a SharedPDF that
+    lives for the duration of the block.
+    """
+    source = as_source(source)
+    if not isinstance(source, memoryview):
+        yield source
+        return
+
+    with SharedPDF(source) as shared:
+        yield shared.ref
+
+
+@contextmanager
+def attach(source):
+    """
+    Yield something an extractor can open: the path or memoryview as-is,
+    or a view of the shared memory behind a SharedRef, detached on exit.
+    The caller must be done with the view (document closed) by then.
+    """
+    source = as_source(source)
+    if not isinstance(source, SharedRef):
+        yield source
+        return
+
+    shm = shared_memory.SharedMemory(name=source.name)
+    view = shm.buf[: source.size]
+    try:
+        yield view
+    finally:
+        # Libraries may keep a reference to the view; release it so the
+        # mapping can close instead of leaking one per statement
+        view.release()
+        shm.close()
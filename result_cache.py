@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# Bump whenever general_parse_statement output changes so stale entries miss
+PARSER_VERSION = "2"
+
+
+def file_digest(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of parsed statements keyed by PDF content hash, parser
+    version and parse options.
+
+    Entries are written to a temp file and renamed into place, so several
+    batch workers can share one cache directory. Reads touch the entry's
+    mtime; when the directory grows past max_bytes (None = unlimited) the
+    least recently used entries are evicted.
+
+    The directory is only walked once on startup and then every
+    rescan_every writes; in between, this process adds the size of what it
+    writes to that estimate (other workers' writes are picked up by the
+    next rescan).
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, rescan_every=100):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.rescan_every = rescan_every
+        self._size = None
+        self._writes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, path, options=None):
+        opts = json.dumps(options or {}, sort_keys=True)
+        h = hashlib.sha256(f"{file_digest(path)}:{PARSER_VERSION}:{opts}".encode())
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        entry = self._entry_path(key)
+        try:
+            with open(entry) as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        try:
+            os.utime(entry)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another worker in the meantime
+        return result
+
+    def put(self, key, result):
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(result, f)
+                written = f.tell()
+            os.replace(tmp, entry)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        if self.max_bytes is None:
+            return
+
+        self._writes += 1
+        if self._size is None or self._writes >= self.rescan_every:
+            self.evict()
+            return
+
+        self._size += written
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Walk the cache directory and, if it's over max_bytes, delete least
+        recently used entries until it's under 90% of it - the headroom
+        means the next walk isn't due again on the very next write.
+        Also refreshes the size estimate.
+        """
+        self._writes = 0
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                p = os.path.join(root, name)
+                try:
+                    st = os.stat(p)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+        self._size = total
+        if self.max_bytes is None or total <= self.max_bytes:
+            return
+
+        # Oldest first
+        target = self.max_bytes * 0.9
+        for mtime, size, p in sorted(entries):
+            try:
+                os.unlink(p)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= target:
+                break
+
+        self._size = total
+
+
+def parse_with_cache(path, parse, cache=None, options=None):
+    """
+    Return parse(path) via the cache: a hit skips extraction and parsing entirely.
+    Cached results come back as they were stored in JSON (e.g. page keys are strings).
+    """
+    if cache is None:
+        return parse(path)
+
+    key = cache.key(path, options)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    result = parse(path)
+    cache.put(key, result)
+    return result
@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+
+from extract_pymupdf import extract_text_pymupdf
+from general_parse_statement import general_parse_statement
+from pdf_input import SharedPDF, attach
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 503: "Service Unavailable",
+}
+
+
+def parse_pdf_bytes(source):
+    # Runs in a pool process: the upload arrives as a SharedRef to shared
+    # memory (or raw bytes), never as a temp file or a pickled copy
+    with attach(source) as data:
+        items = extract_text_pymupdf(data)
+    return general_parse_statement(items)
+
+
+class ParseService:
+    """
+    Localhost HTTP service that parses uploaded statements.
+
+        POST /parse   body = PDF bytes  -> general_parse_statement JSON
+        GET  /stats                     -> queue depth and latency numbers
+
+    Parsing runs in a process pool so one large PDF can't block the event
+    loop. At most `concurrency` uploads are parsed at once; up to `max_queue`
+    more may wait. Uploads still being received count towards the limit, and
+    anything beyond it gets 503 before its body is read, so at most
+    concurrency + max_queue uploads are ever held in memory.
+    """
+
+    def __init__(self, concurrency=2, max_queue=16, latency_window=1000):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.pool = ProcessPoolExecutor(max_workers=concurrency)
+        self.slots = asyncio.Semaphore(concurrency)
+
+        self.receiving = 0
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    async def start(self):
+        # Fork the pool's workers before any connection is accepted; workers
+        # forked mid-request inherit that client's socket and keep it open
+        # after the response, so clients reading to EOF would never finish.
+        # Start the shared-memory resource tracker first so workers share it
+        # rather than each starting one that "cleans up" the parent's uploads
+        resource_tracker.ensure_running()
+        await asyncio.get_running_loop().run_in_executor(self.pool, int)
+
+    def full(self):
+        return self.receiving + self.waiting + self.running >= self.concurrency + self.max_queue
+
+    async def parse(self, data):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with SharedPDF(data) as shared:
+                result = await loop.run_in_executor(self.pool, parse_pdf_bytes, shared.ref)
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Parse failed: %s", e)
+            return 422, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self.running -= 1
+            self.slots.release()
+
+        self.completed += 1
+        self.latencies.append(time.perf_counter() - start)
+        return 200, result
+
+    def stats(self):
+        lat = sorted(self.latencies)
+        latency = {}
+        if lat:
+            latency = {
+                "count": len(lat),
+                "mean": statistics.fmean(lat),
+                "p50": lat[len(lat) // 2],
+                "p95": lat[min(len(lat) - 1, int(len(lat) * 0.95))],
+                "max": lat[-1],
+            }
+        return {
+            "queue_depth": self.waiting,
+            "receiving": self.receiving,
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency_seconds": latency,
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            status, body = await self._dispatch(reader)
+        except (asyncio.IncompleteReadError, ValueError):
+            status, body = 400, {"error": "malformed request"}
+
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) < 2:
+            raise ValueError("bad request line")
+        method, target = request_line[0], request_line[1].split("?")[0]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if target == "/stats":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.stats()
+
+        if target != "/parse":
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        length = int(headers.get("content-length", 0))
+        if length <= 0:
+            return 400, {"error": "empty body"}
+        if length > MAX_UPLOAD_BYTES:
+            return 413, {"error": "upload too large"}
+
+        # Admission is decided on the headers; the body is only read once it has a place
+        if self.full():
+            self.rejected += 1
+            return 503, {"error": "queue full"}
+
+        self.receiving += 1
+        try:
+            data = await reader.readexactly(length)
+        finally:
+            self.receiving -= 1
+        return await self.parse(data)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def serve(host="127.0.0.1", port=8080, concurrency=2, max_queue=16):
+    service = ParseService(concurrency=concurrency, max_queue=max_queue)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    logger.info("Listening on http://%s:%d (concurrency=%d, max_queue=%d)", host, port, concurrency, max_queue)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP statement parsing service.")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-c", "--concurrency", type=int, default=2, help="statements parsed at once")
+    parser.add_argument("-q", "--max-queue", type=int, default=16, help="uploads allowed to wait for a slot")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.concurrency, args.max_queue))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
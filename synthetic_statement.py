@@ -0,0 +1,131 @@
+import random
+from datetime import date, timedelta
+
+import fitz
+
+from keywords import OUTFLOW_KEYWORDS
+
+# Header layouts modelled on the sample statements: (label, x) per column
+HEADER_STYLES = {
+    "standard": {
+        "columns": [("Date", 38), ("Description", 115), ("Payments", 368), ("Deposits", 452), ("Balance", 541)],
+        "date_format": "%d %b %y",
+    },
+    "capitec": {
+        "columns": [
+            ("Posting Date", 48), ("Transaction Date", 110), ("Description", 171),
+            ("Money In (R)", 364), ("Money Out (R)", 422), ("Balance (R)", 523),
+        ],
+        "date_format": "%d/%m/%Y",
+    },
+    "fnb": {
+        "columns": [("Date", 40), ("Description", 110), ("Amount", 380), ("Balance", 480)],
+        "date_format": "%d %b %Y",
+    },
+}
+
+# Two narrow tables side by side, like the credit card statements
+DUAL_COLUMNS = [("Date", 31), ("Description", 85), ("Amount", 253)]
+DUAL_OFFSET = 269
+
+DESCRIPTIONS = [
+    "WOOLWORTHS 5222*0536 10 NOV", "DISCHEM CANAL 5222*0536", "Fund Transfers",
+    "Cash Withdrawal Cpc", "ATM Cash Withdrawal Fee", "Simply Asia Nb5278",
+    "Monthly Account Fee", "Salary ACME Holdings", "Debit Order Insurance",
+    "Prepaid Electricity", "Interest Received", "Card Purchase Engen",
+]
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+HEADER_Y = 180
+ROW_HEIGHT = 11
+FONT_SIZE = 7
+
+
+def _columns(style, dual):
+    if dual:
+        return DUAL_COLUMNS + [(label, x + DUAL_OFFSET) for label, x in DUAL_COLUMNS]
+    return HEADER_STYLES[style]["columns"]
+
+
+def _row_cells(columns, date_format, rng, day, balance):
+    # Fill one row's cells in column order; returns (cells, new balance).
+    # When there are several amount columns (money in/out) only one is used:
+    # the outflow column for debits, the other one for credits.
+    amount_cols = [label for label, _ in columns if _is_amount(label)]
+    amount = round(rng.uniform(-5000, 5000), 2)
+    outflow = [label for label in amount_cols if any(w in label.lower() for w in OUTFLOW_KEYWORDS)]
+    inflow = [label for label in amount_cols if label not in outflow]
+    if outflow and inflow:
+        used = outflow[0] if amount < 0 else inflow[0]
+    else:
+        used = rng.choice(amount_cols) if amount_cols else None
+
+    cells = []
+    for label, x in columns:
+        name = label.lower()
+        if "date" in name:
+            cells.append((day.strftime(date_format), x + 2))
+        elif "description" in name:
+            cells.append((rng.choice(DESCRIPTIONS), x + 2))
+        elif "balance" in name:
+            cells.append((f"{balance + amount:,.2f}", x + 2))
+        elif label == used:
+            cells.append((f"{amount:,.2f}", x + 2))
+    return cells, balance + amount
+
+
+def _is_amount(label):
+    name = label.lower()
+    return not any(k in name for k in ("date", "description", "balance"))
+
+
+def generate_statement(path, pages=10, rows_per_page=40, style="standard", dual=False, seed=0):
+    """
+    Write a synthetic statement PDF with PyMuPDF.
+    rows_per_page controls transaction density (capped to what fits on A4).
+    Returns the number of transaction rows written.
+    """
+    rng = random.Random(seed)
+    columns = _columns(style, dual)
+    date_format = HEADER_STYLES[style]["date_format"]
+    max_rows = int((PAGE_HEIGHT - HEADER_Y - 60) / ROW_HEIGHT)
+    rows_per_page = min(rows_per_page, max_rows)
+
+    doc = fitz.open()
+    day = date(2024, 1, 1)
+    balance = 10000.0
+    written = 0
+
+    for pno in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+
+        # Page furniture the parser has to skip over
+        page.insert_text((38, 60), "Synthetic Bank Statement", fontsize=14)
+        page.insert_text((38, 80), "Account number: 12 345 678 9", fontsize=FONT_SIZE)
+        page.insert_text((400, 80), f"Page {pno + 1} of {pages}", fontsize=FONT_SIZE)
+
+        for label, x in columns:
+            page.insert_text((x, HEADER_Y), label, fontsize=FONT_SIZE)
+
+        y = HEADER_Y + ROW_HEIGHT * 2
+        for _ in range(rows_per_page):
+            if rng.random() < 0.3:
+                day += timedelta(days=1)
+            if dual:
+                # The right-hand table carries on a couple of weeks later
+                left, balance = _row_cells(DUAL_COLUMNS, date_format, rng, day, balance)
+                right, balance = _row_cells(columns[len(DUAL_COLUMNS):], date_format, rng, day + timedelta(days=14), balance)
+                cells = left + right
+            else:
+                cells, balance = _row_cells(columns, date_format, rng, day, balance)
+            for text, x in cells:
+                page.insert_text((x, y), text, fontsize=FONT_SIZE)
+            y += ROW_HEIGHT
+            written += 2 if dual else 1
+
+        page.insert_text((38, PAGE_HEIGHT - 30), "Terms and conditions apply.", fontsize=FONT_SIZE)
+
+    doc.save(path)
+    doc.close()
+    return written
@@ -0,0 +1,83 @@
+import logging
+
+import metrics
+from extract_pymupdf import open_pdf, read_page
+from general_parse_statement import detect_page_header, extract_transactions_with_dates
+from keywords import DEFAULT_MATCHER
+
+logger = logging.getLogger(__name__)
+
+
+def header_strength(header_info, matcher=None):
+    """
+    (keyword hits, has a date column) for a detected header.
+    """
+    matcher = matcher or DEFAULT_MATCHER
+    if not header_info or not header_info.get("headings"):
+        return 0, False
+
+    texts = [h["text"].lower() for h in header_info["headings"]]
+    hits = matcher.hits(" ".join(texts))
+    has_date = any(matcher.role(t) == "date" for t in texts)
+    return hits, has_date
+
+
+def table_region(header_info, x_tol=50, y_band=18):
+    """
+    Left/top edges of the transaction table: from just above the heading row
+    (room for wrapped heading text) and from the first column's x, less the
+    column tolerance used when assigning cells.
+    """
+    xs = [h["x"] for h in header_info["headings"]]
+    return max(0, min(xs) - x_tol - 2), max(0, header_info["y"] - y_band)
+
+
+def iter_parse_pdf_roi(path, chunk_size=3000, layout_cache=None, matcher=None, compact=False):
+    """
+    Like iter_parse_pages(iter_text_pymupdf(path)), but once a page's table
+    header is known the following pages are only extracted inside the table
+    region, so logos, address blocks and summary boxes above the table are
+    never decoded. Image blocks are never decoded at all (see TEXT_FLAGS).
+
+    A clipped page is trusted only if a header at least as strong as the one
+    that defined the region turns up inside the clip; otherwise the page is
+    re-extracted in full and the region widened to fit.
+    Yields (page_number, header_info, transactions).
+    """
+    region = None  # (x0, y0, hits)
+
+    with open_pdf(path) as doc:
+        for page in doc:
+            pg = page.number + 1
+            header_info = None
+
+            if region is not None:
+                x0, y0, min_hits = region
+                clip = (x0, y0, page.rect.x1, page.rect.y1)
+                with metrics.stage("extract_text_pymupdf", pages=1, clipped=1):
+                    page_items = read_page(page, compact, clip=clip)
+
+                if page_items:
+                    header_info = detect_page_header(page_items, chunk_size, layout_cache, matcher)
+                    hits, has_date = header_strength(header_info, matcher)
+                    if not has_date or hits < min_hits:
+                        logger.debug("Page %s: header not inside table region, reading full page", pg)
+                        header_info = None
+
+            if header_info is None:
+                with metrics.stage("extract_text_pymupdf", pages=1):
+                    page_items = read_page(page, compact)
+                if not page_items:
+                    continue
+
+                header_info = detect_page_header(page_items, chunk_size, layout_cache, matcher)
+                hits, has_date = header_strength(header_info, matcher)
+                if has_date:
+                    x0, y0 = table_region(header_info)
+                    if region is not None:
+                        x0, y0 = min(x0, region[0]), min(y0, region[1])
+                    region = (x0, y0, hits)
+
+            header_info["page_number"] = pg
+            transactions = extract_transactions_with_dates(page_items, header_info, matcher=matcher)
+            yield pg, header_info, transactions
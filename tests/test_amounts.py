@@ -0,0 +1,75 @@
+import pytest
+
+from amounts import balance_breaks, normalize_transactions, to_cents
+from general_parse_statement import extract_transactions_with_dates, find_heading_row
+
+
+@pytest.mark.parametrize("text, cents", [
+    ("-8,000.00", -800000),
+    ("8 000.00", 800000),
+    ("1234.5", 123450),
+    ("12", 1200),
+    ("R1,200.50", 120050),
+    ("R -3.10", -310),
+    ("(45.00)", -4500),
+    ("45.00-", -4500),
+    ("1,200.00 Cr", 120000),
+    ("300.00Dr", -30000),
+    ("R 1 000.00 cr", 100000),
+])
+def test_to_cents_formats(text, cents):
+    assert to_cents([text]) == [cents]
+
+
+@pytest.mark.parametrize("text", [None, "", "abc", "1,23", "(5", "12.345"])
+def test_to_cents_rejects_non_amounts(text):
+    assert to_cents([text]) == [None]
+
+
+def test_to_cents_keeps_column_alignment():
+    assert to_cents(["1.00", None, "x", "-2.00"]) == [100, None, None, -200]
+    assert to_cents([]) == []
+
+
+def test_balance_breaks():
+    amounts = [None, -500, 1000, -250]
+    balances = [10000, 9500, 10500, 10000]
+    assert balance_breaks(amounts, balances) == [3]
+
+
+def debit_credit_page():
+    # Date | Description | Debit  ‖  Date | Description | Credit
+    items = [
+        {"text": t, "x": x, "y": 100, "page_number": 1}
+        for t, x in [("Date", 40), ("Description", 100), ("Debit", 240),
+                     ("Date", 320), ("Description", 380), ("Credit", 520)]
+    ]
+    for k in range(3):
+        y = 120 + k * 15
+        items += [
+            {"text": t, "x": x, "y": y, "page_number": 1}
+            for t, x in [(f"0{k + 1} Nov 2025", 40), ("Card", 100), ("20.00", 242),
+                         (f"0{k + 1} Nov 2025", 320), ("Deposit", 380), ("500.00", 522)]
+        ]
+    return items
+
+
+def test_outflow_sign_is_per_table():
+    items = debit_credit_page()
+    header_info = find_heading_row(items)
+    header_info["page_number"] = 1
+    transactions = extract_transactions_with_dates(items, header_info)
+
+    cols = normalize_transactions(transactions, header_info)
+    assert cols["amount"] == [-2000, 50000] * 3
+
+
+def test_normalize_flags_balance_breaks_per_table():
+    transactions = [
+        {"date": "01 Nov 2025", "amount": "100.00", "balance": "1,100.00", "table": 0},
+        {"date": "01 Nov 2025", "amount": "5.00", "balance": "50.00", "table": 1},
+        {"date": "02 Nov 2025", "amount": "-50.00", "balance": "1,050.00", "table": 0},
+        {"date": "02 Nov 2025", "amount": "5.00", "balance": "60.00", "table": 1},
+    ]
+    cols = normalize_transactions(transactions)
+    assert cols["balance_break"] == [False, False, False, True]
@@ -0,0 +1,58 @@
+import io
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import batch
+from amounts import normalize_transactions
+from batch import statement_pages
+from general_parse_statement import general_parse_statement
+
+
+def item(text, x, y, page_number):
+    return {"text": text, "x": x, "y": y, "page_number": page_number}
+
+
+def cover_page_statement():
+    # Cover page first, then a Capitec-style table with unsigned Money Out
+    items = [item("Welcome to your statement", 40, 60, 1), item("Account 1234", 40, 80, 1)]
+    items += [
+        item(text, x, 100, 2)
+        for text, x in [("Date", 40), ("Description", 100), ("Money In", 300), ("Money Out", 380), ("Balance", 460)]
+    ]
+    for k in range(3):
+        y = 120 + k * 15
+        items += [
+            item(f"0{k + 1} Nov 2025", 40, y, 2), item("Shop", 100, y, 2),
+            item("20.00", 382, y, 2), item(f"{900 - k * 20}.00", 462, y, 2),
+        ]
+    return items
+
+
+def test_statement_pages_pair_transactions_with_their_header():
+    # Round-trip through JSON like results coming back from the result cache
+    result = json.loads(json.dumps(general_parse_statement(cover_page_statement())))
+
+    pages = list(statement_pages(result))
+    assert [(pg, len(txs)) for pg, _, txs in pages] == [(1, 0), (2, 3)]
+
+    _, header_info, transactions = pages[1]
+    assert normalize_transactions(transactions, header_info)["amount"] == [-2000] * 3
+
+
+def fake_parse_file(path, prefilter=False, layout_cache=None):
+    if path.endswith("crash.pdf"):
+        os._exit(1)  # like MuPDF segfaulting on a malformed PDF
+    return {"transactions": [], "headings": {}, "transaction_counts": {}}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched parse_file")
+def test_dead_worker_fails_only_its_file(monkeypatch):
+    monkeypatch.setattr(batch, "parse_file", fake_parse_file)
+    paths = [f"{i}.pdf" for i in range(12)] + ["crash.pdf"]
+
+    succeeded, failed = batch.run_batch(paths, workers=3, jsonl=io.StringIO())
+    assert failed == ["crash.pdf"]
+    assert sorted(succeeded) == sorted(paths[:-1])
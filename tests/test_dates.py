@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+
+from dates import _split_date, is_valid_date, normalize_date
+
+
+@pytest.mark.parametrize("text, parts", [
+    ("07/12/2025", (7, 12, 2025)),
+    ("7/12/25", (7, 12, 2025)),
+    ("7th December 2025", (7, 12, 2025)),
+    ("13 Nov 24", (13, 11, 2024)),
+    ("21 Oct", (21, 10, None)),
+    ("21 Foo 25", None),
+    ("Balance", None),
+])
+def test_split_date(text, parts):
+    assert _split_date(text) == parts
+
+
+def test_yearless_dates_need_allow_no_year():
+    assert not is_valid_date("21 Oct")
+    assert is_valid_date("21 Oct", allow_no_year=True)
+
+
+def test_normalize_date():
+    assert normalize_date("6 Oct 25") == "2025-10-06"
+    assert normalize_date(" 31/08/2018 ") == "2018-08-31"
+    assert normalize_date("31 Feb 25") is None
+    assert normalize_date("21 Oct") is None  # no period to take the year from
+
+
+def test_yearless_dates_across_year_end():
+    period_from, period_to = date(2024, 10, 15), date(2025, 1, 14)
+    assert normalize_date("21 Oct", period_from, period_to) == "2024-10-21"
+    assert normalize_date("21 Dec", period_from, period_to) == "2024-12-21"
+    assert normalize_date("05 Jan", period_from, period_to) == "2025-01-05"
+    assert normalize_date("20 Nov", period_from, period_to) == "2024-11-20"
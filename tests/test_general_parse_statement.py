@@ -0,0 +1,39 @@
+from general_parse_statement import find_heading_row, general_parse_statement
+
+
+def item(text, x, y, page_number=1):
+    return {"text": text, "x": x, "y": y, "page_number": page_number}
+
+
+def summary_box_page():
+    # An account summary box above the transaction table: it scores as many
+    # header keywords as the real header and has a date-like cell
+    items = [
+        item("Statement Date", 40, 60), item("Credit Limit", 150, 60),
+        item("Available Balance", 300, 60), item("Payment Due", 450, 60),
+        item("01 Nov 2025", 40, 75), item("5,000.00", 150, 75),
+        item("3,200.00", 300, 75), item("25 Nov 2025", 450, 75),
+        item("Date", 40, 200), item("Description", 110, 200),
+        item("Amount", 370, 200), item("Balance", 480, 200),
+    ]
+    for k in range(5):
+        y = 220 + k * 15
+        items += [
+            item(f"0{k + 1} Nov 2025", 40, y), item(f"Shop {k}", 110, y),
+            item(f"-{k + 1}0.00", 372, y), item(f"{1000 - k}.00", 482, y),
+        ]
+    return items
+
+
+def test_summary_box_is_not_taken_as_header():
+    header_info = find_heading_row(summary_box_page())
+    assert header_info["y"] == 200
+    assert [h["text"] for h in header_info["headings"]] == ["Date", "Description", "Amount", "Balance"]
+
+
+def test_summary_box_page_transactions():
+    transactions = general_parse_statement(summary_box_page())["transactions"]
+    assert len(transactions) == 5
+    assert transactions[0] == {
+        "date1": "01 Nov 2025", "description1": "Shop 0", "amount1": "-10.00", "balance1": "1000.00",
+    }
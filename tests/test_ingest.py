@@ -0,0 +1,48 @@
+from ingest import AccountIndex, fingerprints, is_brought_forward, transaction_key
+
+
+def tx(date, description, amount, balance=None):
+    return {"date": date, "description": description, "amount": amount, "balance": balance}
+
+
+def test_transaction_key_normalises_formats():
+    a = transaction_key(tx("6 Oct 25", "Simply  Asia", "1,200.00"))
+    b = transaction_key(tx("06/10/2025", "simply asia", "1200.00"))
+    assert a == b
+
+
+def test_identical_rows_get_distinct_fingerprints():
+    coffee = tx("3 Nov 25", "Coffee", "-50.00")
+    fps = [fp for fp, _ in fingerprints([coffee, dict(coffee)])]
+    assert len(set(fps)) == 2
+
+
+def test_brought_forward_rows():
+    assert is_brought_forward(tx("6 Oct 25", "Balance Brought Forward", "2,610.34"))
+    assert is_brought_forward(tx("6 Oct 25", "Bal B/F", "2,610.34"))
+    assert not is_brought_forward(tx("6 Oct 25", "Fund Transfers", "-8,000.00"))
+
+
+def test_overlapping_statements_only_add_new_rows(tmp_path):
+    coffee = tx("3 Nov 25", "Coffee", "-50.00")
+    october = [
+        tx("1 Oct 25", "Balance Brought Forward", "100.00"),
+        tx("2 Oct 25", "Salary", "5,000.00"),
+        coffee, dict(coffee),
+    ]
+    # The quarterly statement repeats both coffees, then adds a third and a new row
+    quarter = [
+        tx("1 Oct 25", "Balance Brought Forward", "100.00"),
+        tx("02/10/2025", "Salary", "5000.00"),
+        dict(coffee), dict(coffee), dict(coffee),
+        tx("4 Nov 25", "Rent", "-4,000.00"),
+    ]
+
+    index = AccountIndex(str(tmp_path))
+    assert len(index.merge("acc", october)) == 3
+    new = index.merge("acc", quarter)
+    assert new == [coffee, tx("4 Nov 25", "Rent", "-4,000.00")]
+
+    # The index is persistent: a fresh instance sees everything already merged
+    assert AccountIndex(str(tmp_path)).merge("acc", quarter) == []
+    assert len(index.transactions("acc")) == 5
@@ -0,0 +1,17 @@
+from layout_cache import LayoutCache
+
+
+def header(*columns, y=100):
+    return {"y": y, "headings": [{"text": text, "x": x, "y": y} for text, x in columns]}
+
+
+def test_workers_saving_one_file_keep_each_others_templates(tmp_path):
+    path = str(tmp_path / "layouts.json")
+    a, b = LayoutCache(path), LayoutCache(path)
+
+    a.add(header(("Date", 40), ("Description", 100), ("Amount", 300), ("Balance", 400)))
+    b.add(header(("Date", 50), ("Details", 120), ("Money Out", 320), ("Balance", 420), y=180))
+    a.save()
+    b.save()
+
+    assert len(LayoutCache(path)) == 2
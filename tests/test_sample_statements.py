@@ -0,0 +1,34 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from extract_pymupdf import extract_text_pymupdf  # noqa: E402
+from general_parse_statement import general_parse_statement  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Transactions parsed from each bundled sample
+with open(os.path.join(ROOT, "tests", "data", "sample_transactions.json")) as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_sample_statement_transactions(name):
+    items = extract_text_pymupdf(os.path.join(ROOT, name))
+    assert general_parse_statement(items)["transactions"] == EXPECTED[name]
+
+
+
+@pytest.mark.parametrize("name", ["StandardBankSample.pdf", "5 November 2025.pdf"])
+def test_sample_statement_parallel_extraction(name):
+    items = extract_text_pymupdf(os.path.join(ROOT, name), workers=2)
+    assert general_parse_statement(items)["transactions"] == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", ["StandardBankSample.pdf", "5 November 2025.pdf"])
+def test_sample_statement_compact_items(name):
+    items = extract_text_pymupdf(os.path.join(ROOT, name), compact=True)
+    assert general_parse_statement(items)["transactions"] == EXPECTED[name]
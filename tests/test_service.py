@@ -0,0 +1,20 @@
+import asyncio
+
+from service import ParseService
+
+
+def test_full_queue_rejects_before_reading_the_body():
+    async def run():
+        service = ParseService(concurrency=1, max_queue=1)
+        try:
+            service.receiving = 2  # two uploads still arriving fill the service
+
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"POST /parse HTTP/1.1\r\nContent-Length: 1000000\r\n\r\n")
+            # Only headers were sent: admitting the upload would wait for the body
+            return await asyncio.wait_for(service._dispatch(reader), 1)
+        finally:
+            service.close()
+
+    status, body = asyncio.run(run())
+    assert status == 503
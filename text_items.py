@@ -0,0 +1,51 @@
+import sys
+
+
+class TextItem:
+    """
+    Compact stand-in for the {"text", "x", "y", "page_number"} line dicts.
+    Uses __slots__ (about a third of a dict's size) and interns the text so
+    repeated labels share one string. Supports item["x"] style access, so it
+    can be passed to every general_parse_statement function unchanged.
+    """
+
+    __slots__ = ("text", "x", "y", "page_number")
+
+    # Dict-style access straight onto the slot descriptors (no Python-level call)
+    __getitem__ = object.__getattribute__
+
+    def __init__(self, text, x, y, page_number):
+        self.text = sys.intern(text)
+        self.x = x
+        self.y = y
+        self.page_number = page_number
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self):
+        return {"text": self.text, "x": self.x, "y": self.y, "page_number": self.page_number}
+
+    # Compare by value like the dicts did, so `it not in row_items` behaves the same
+    def __eq__(self, other):
+        if isinstance(other, TextItem):
+            return (self.text, self.x, self.y, self.page_number) == (other.text, other.x, other.y, other.page_number)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.text, self.x, self.y, self.page_number))
+
+    def __repr__(self):
+        return f"TextItem({self.text!r}, x={self.x:.1f}, y={self.y:.1f}, page={self.page_number})"
+
+
+def compact_items(items):
+    """
+    Convert a list of line dicts into TextItems.
+    """
+    return [TextItem(i["text"], i["x"], i["y"], i["page_number"]) for i in items]
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+
+# Imported up front on purpose: the point of this process is to pay for
+# interpreter, fitz and parser start-up once and then stay warm
+import batch
+
+
+def handle(line):
+    path = line.strip()
+    if not path:
+        return None
+
+    record = batch.process_file(path)
+    record.pop("traceback", None)
+    return json.dumps(record)
+
+
+def serve_stdin(out):
+    """
+    Read one PDF path per line from stdin, answer with one JSON line each.
+    """
+    for line in sys.stdin:
+        response = handle(line)
+        if response is not None:
+            out.write(response + "\n")
+            out.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            response = handle(line.decode())
+            if response is not None:
+                self.wfile.write(response.encode() + b"\n")
+                self.wfile.flush()
+
+
+def serve_socket(path):
+    """
+    Same line protocol as serve_stdin, over a local Unix socket.
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with socketserver.UnixStreamServer(path, _Handler) as server:
+        print(f"Worker listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-running statement parser fed with PDF paths.")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--prefilter", action="store_true", help="skip pages with no transaction table before full extraction")
+    parser.add_argument("--cache-dir", help="reuse parsed results for identical PDFs from this directory")
+    parser.add_argument("--cache-size-mb", type=int, default=512, help="result cache size limit (default: 512)")
+    parser.add_argument("--layout-cache", help="JSON file of known header layouts, reused and updated across runs")
+    args = parser.parse_args(argv)
+
+    batch.init_worker(args.cache_dir, args.cache_size_mb * 1024 * 1024, args.prefilter, args.layout_cache)
+
+    try:
+        if args.socket:
+            serve_socket(args.socket)
+        else:
+            # Answers go to a private copy of stdout; fd 1 itself now points at
+            # stderr, so stray prints from libraries can't break the protocol
+            sys.stdout.flush()
+            out = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+            os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+            serve_stdin(out)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
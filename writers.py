@@ -0,0 +1,150 @@
+import csv
+import importlib
+import json
+import os
+
+from amounts import normalize_transactions
+from dates import to_date
+from general_parse_statement import transaction_field
+
+# Flat row shape shared by every tabular writer. Multi-column tables
+# (date1, amount2, ...) keep their first filled column per role; the full
+# transaction is still available in NDJSON output.
+COLUMNS = ("source", "page", "date", "description", "amount", "balance")
+
+
+def transaction_rows(source, transactions, page=None):
+    for tx in transactions:
+        yield {
+            "source": source,
+            "page": page,
+            "date": transaction_field(tx, "date"),
+            "description": transaction_field(tx, "description"),
+            "amount": transaction_field(tx, "amount"),
+            "balance": transaction_field(tx, "balance"),
+        }
+
+
+class NdjsonWriter:
+    """
+    One JSON object per transaction, flushed as each page/statement is
+    written so readers can tail the file while a batch is still running.
+    """
+
+    def __init__(self, path):
+        self.f = open(path, "w")
+
+    def write(self, source, transactions, page=None, header_info=None):
+        for tx in transactions:
+            self.f.write(json.dumps({"source": source, "page": page, **tx}) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.f = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.f, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, source, transactions, page=None, header_info=None):
+        self.writer.writerows(transaction_rows(source, transactions, page))
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class ColumnarWriter:
+    """
+    Arrow IPC ("arrow") or Parquet ("parquet") output with a fixed, typed
+    schema: dates as date32 and amounts/balances as int64 cents (see
+    amounts.normalize_transactions), so readers don't re-parse strings, and
+    a balance_break flag on rows that fail the running-balance check.
+    Pass the page's header_info to write() so unsigned Money Out / Debit
+    amounts come out negative. Rows are buffered and written as a record
+    batch / row group every batch_rows rows, so memory stays bounded
+    however many statements go in.
+    Needs pyarrow, which is only imported when this writer is used.
+    """
+
+    def __init__(self, path, fmt="parquet", batch_rows=50_000):
+        try:
+            self.pa = importlib.import_module("pyarrow")
+        except ImportError:
+            raise RuntimeError(f"{fmt} output needs pyarrow (pip install pyarrow)") from None
+
+        pa = self.pa
+        self.schema = pa.schema([
+            ("source", pa.string()),
+            ("page", pa.int32()),
+            ("date", pa.date32()),
+            ("description", pa.string()),
+            ("amount_cents", pa.int64()),
+            ("balance_cents", pa.int64()),
+            ("balance_break", pa.bool_()),
+        ])
+        self.batch_rows = batch_rows
+        self.buffer = {name: [] for name in self.schema.names}
+
+        if fmt == "parquet":
+            pq = importlib.import_module("pyarrow.parquet")
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, source, transactions, page=None, header_info=None):
+        cols = normalize_transactions(transactions, header_info)
+        self.buffer["source"] += [source] * len(transactions)
+        self.buffer["page"] += [page] * len(transactions)
+        self.buffer["date"] += [to_date(d) for d in cols["date"]]
+        self.buffer["description"] += cols["description"]
+        self.buffer["amount_cents"] += cols["amount"]
+        self.buffer["balance_cents"] += cols["balance"]
+        self.buffer["balance_break"] += cols["balance_break"]
+
+        if len(self.buffer["source"]) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer["source"]:
+            return
+        batch = self.pa.RecordBatch.from_pydict(self.buffer, schema=self.schema)
+        self.writer.write_table(self.pa.Table.from_batches([batch]))
+        self.buffer = {name: [] for name in self.schema.names}
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+WRITERS = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "parquet": lambda path: ColumnarWriter(path, "parquet"),
+    "arrow": lambda path: ColumnarWriter(path, "arrow"),
+}
+
+EXTENSIONS = {
+    ".ndjson": "ndjson", ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow", ".feather": "arrow",
+}
+
+
+def open_writer(path, fmt=None):
+    """
+    Writer for path; fmt is one of WRITERS, or taken from the file extension.
+    Every writer has write(source, transactions, page=None, header_info=None) and close().
+    """
+    if fmt is None:
+        fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Can't tell output format from {path!r}, expected one of: {', '.join(EXTENSIONS)}")
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of: {', '.join(WRITERS)}")
+
+    return WRITERS[fmt](path)